@@ -0,0 +1,150 @@
+"""Monte Carlo advice on which card to lead."""
+import os
+import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from table.engine import PLAYED, RandomPolicy, WIDOW
+from table.scorer import SEGMENTS
+
+
+def sample(hand, seat, rng):
+    """
+    Return a copy of the hand with the cards unseen by the given seat dealt
+    at random, consistent with what the seat knows: its own cards, the cards
+    played, the card turned up, the size of each hand and the cards seen to
+    stop sequences.
+    """
+    dead = hand.known_widow | {hand.trump_card}
+    unseen = [c for c, owner in enumerate(hand.owner)
+              if owner != PLAYED and c not in dead
+              and c not in hand.hands[seat]]
+    rng.shuffle(unseen)
+
+    other = hand.copy()
+    sizes = [(WIDOW, hand.owner.count(WIDOW) - len(dead))]
+    sizes += [(s, len(cards)) for s, cards in enumerate(hand.hands)
+              if s != seat]
+    start = 0
+    for owner, size in sizes:
+        cards = unseen[start:start + size]
+        start += size
+        for c in cards:
+            other.owner[c] = owner
+        if owner != WIDOW:
+            other.hands[owner] = set(cards)
+    return other
+
+
+def payoff(seat, segment_winners, player_cards, pots):
+    """
+    Return the counters a seat gains at the end of the round, following the
+    scorer: segment winners collect the segment's counters, and the game
+    winner collects a counter for every card left in the other hands.
+    """
+    gain = sum(pots[segment] for segment, winner in segment_winners.items()
+               if winner == seat)
+    if segment_winners["Game"] == seat:
+        gain += sum(player_cards.values())
+    else:
+        gain -= player_cards[seat]
+    return gain
+
+
+def _rollouts(hand, seat, pots, rollout, budget, seed):
+    """
+    Sample and play out the hand after each legal lead, until the time
+    budget is spent, returning the total payoff and count for each lead.
+    """
+    deadline = time.perf_counter() + budget
+    rng = random.Random(seed)
+    policies = [rollout or RandomPolicy(rng)] * len(hand.hands)
+    seats = list(range(len(hand.hands)))
+    leads = hand.legal_leads()
+    totals = [0] * len(leads)
+    counts = [0] * len(leads)
+    while True:
+        for i, c in enumerate(leads):
+            played = sample(hand, seat, rng)
+            played.lead(c)
+            played.play(policies)
+            totals[i] += payoff(seat, *played.result(seats), pots)
+            counts[i] += 1
+        if time.perf_counter() > deadline:
+            return totals, counts
+
+
+class Advisor:
+    """Evaluates the cards a player could lead by simulating the hand."""
+
+    def __init__(self, time_budget=0.2, workers=None, rollout=None):
+        """
+        Initialise the pool of processes used to simulate hands.
+        :param time_budget:  The number of seconds to spend on advice
+        :param workers:  The number of processes to simulate with
+        :param rollout:  The policy played by all seats in simulated hands,
+                         defaulting to leading at random
+        """
+        self.time_budget = time_budget
+        self.workers = workers or os.cpu_count() or 1
+        self.rollout = rollout
+        self.executor = (ProcessPoolExecutor(self.workers)
+                         if self.workers > 1 else None)
+
+    def close(self):
+        """Shut down the pool of processes."""
+        if self.executor:
+            self.executor.shutdown()
+
+    def __enter__(self):
+        """Use the advisor as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Shut down the pool on leaving the context."""
+        self.close()
+
+    def advise(self, hand, seat, pots=None):
+        """
+        Return the expected payoff of each card the seat could lead, best
+        first.
+        :param hand:  The state of play, with the seat to lead
+        :param seat:  The seat to advise
+        :param pots:  The counters in each segment, defaulting to the stakes
+                      of a freshly dressed board
+        """
+        pots = dict(pots or SEGMENTS)
+        leads = hand.legal_leads()
+        if len(leads) == 1:
+            return OrderedDict([(leads[0], 0.0)])
+
+        # Leave time for collecting the results
+        budget = 0.8 * self.time_budget
+        seeds = [random.getrandbits(64) for _ in range(self.workers)]
+        args = (hand, seat, pots, self.rollout, budget)
+        if self.executor:
+            results = list(self.executor.map(
+                _rollouts, *zip(*(args + (s,) for s in seeds))
+            ))
+        else:
+            results = [_rollouts(*args, seeds[0])]
+
+        totals = [sum(r[0][i] for r in results) for i in range(len(leads))]
+        counts = [sum(r[1][i] for r in results) for i in range(len(leads))]
+        expected = {c: total / count
+                    for c, total, count in zip(leads, totals, counts)}
+        return OrderedDict(sorted(expected.items(), key=lambda e: -e[1]))
+
+
+class AdvisedPolicy:
+    """Policy leading the card recommended by an advisor."""
+
+    def __init__(self, advisor, pots=None):
+        """Initialise with the advisor and the counters in each segment."""
+        self.advisor = advisor
+        self.pots = pots
+
+    def __call__(self, hand, seat):
+        """Choose a card to lead."""
+        return next(iter(self.advisor.advise(hand, seat, self.pots)))
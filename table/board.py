@@ -1,13 +1,14 @@
 """Management of the board display."""
 import numpy as np
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
+from functools import lru_cache
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QBrush, QColor, QFont, QImage, QPen
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QBrush, QColor, QFont, QPen
 from PyQt5.QtWidgets import QComboBox, QGraphicsScene, QGraphicsView
 
-from table.resources import background_image_file
-from table.scorer import Phase, SEGMENTS
+from table.resources import background_image
+from table.scorer import LINKED_SEGMENTS, Phase, SEGMENTS
 
 
 class Winner(QComboBox):
@@ -37,7 +38,7 @@ class Winner(QComboBox):
         """
         w = self.rect().width()
         h = self.rect().height()
-        super().move(x - w / 2, y - h / 2)
+        super().move(round(x - w / 2), round(y - h / 2))
 
     def automatically_populates(self, *winners):
         """
@@ -53,10 +54,57 @@ class Winner(QComboBox):
         self.currentIndexChanged.connect(callback)
 
 
+# Positions of all board items for a given radius
+Geometry = namedtuple("Geometry", [
+    "radius", "boundaries", "labels", "counts", "winners",
+    "label_size", "count_size", "winner_size", "line_width",
+])
+
+# Radial fractions of the items placed in each segment
+_FRACTIONS = np.array([0.1, 0.9, 0.9, 0.4, 0.7])
+# Angular offsets (in segments) of boundary ends, labels, counts and widgets
+_OFFSETS = np.array([0, 0, 0.5, 0.5, 0.5])
+
+
+@lru_cache(maxsize=32)
+def board_geometry(radius, pixel_ratio=1.0):
+    """
+    Return the positions of all board items for a board of the given radius,
+    snapped to the device pixels of the screen.
+    """
+    n = len(SEGMENTS)
+    theta = 2 * np.pi * (np.arange(n) + _OFFSETS[:, None]) / n
+    xy = radius * (1 + _FRACTIONS[:, None, None]
+                   * np.stack([np.cos(theta), np.sin(theta)], axis=-1))
+    xy = np.round(xy * pixel_ratio) / pixel_ratio
+    scale = radius / Board.RADIUS
+    return Geometry(
+        radius=radius,
+        boundaries=tuple(map(tuple, np.concatenate(xy[:2], axis=1))),
+        labels=tuple(map(tuple, xy[2])),
+        counts=tuple(map(tuple, xy[3])),
+        winners=tuple(map(tuple, xy[4])),
+        label_size=max(1, round(20 * scale)),
+        count_size=max(1, round(40 * scale)),
+        winner_size=max(9, round(15 * scale)),
+        line_width=max(1, round(10 * scale)),
+    )
+
+
+def _centre(item, x, y):
+    """Position a text item centred on the given point."""
+    centre = item.boundingRect().center()
+    item.setPos(x - centre.x(), y - centre.y())
+
+
 class Board(QGraphicsView):
     """Representation of the state of the board."""
 
+    # Default and minimum radius of the board
     RADIUS = 270
+    MIN_RADIUS = 150
+    # Size of the view relative to the board
+    MARGIN = 1.1
 
     def __init__(self, players, game_winner_cb):
         """
@@ -67,113 +115,136 @@ class Board(QGraphicsView):
         scene = QGraphicsScene()
         super().__init__(scene)
 
-        self.setMinimumWidth(self.RADIUS * 2.2)
-        self.setMinimumHeight(self.RADIUS * 2.2)
+        size = int(2 * self.MARGIN * self.MIN_RADIUS)
+        self.setMinimumSize(size, size)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 
         self._draw_background(scene)
 
         self.counts = self._place_counts(scene)
         self.winners = self._place_winners(scene, players)
 
-        self.winners["Intrigue"].automatically_populates(
-            self.winners["Jack"], self.winners["Queen"]
-        )
-        self.winners["Matrimony"].automatically_populates(
-            self.winners["Queen"], self.winners["King"]
-        )
+        for segment, linked in LINKED_SEGMENTS.items():
+            self.winners[segment].automatically_populates(
+                *(self.winners[s] for s in linked)
+            )
         game_winner = self.winners["Game"]
         game_winner.currentIndexChanged.connect(
             lambda: game_winner_cb(game_winner)
         )
 
-    @staticmethod
-    def _segment_angles():
-        """Return a list of angles in the middle of segments."""
-        return [2 * np.pi * (i + 0.5) / len(SEGMENTS)
-                for i in range(len(SEGMENTS))]
+        self.layout_geometry = None
+        self.set_radius(self.RADIUS)
+
+    def sizeHint(self):
+        """Prefer the size fitting the default radius."""
+        size = int(2 * self.MARGIN * self.RADIUS)
+        return QSize(size, size)
+
+    def resizeEvent(self, event):
+        """Scale the board to fit the view."""
+        super().resizeEvent(event)
+        size = self.viewport().size()
+        radius = int(min(size.width(), size.height()) / (2 * self.MARGIN))
+        self.set_radius(max(radius, self.MIN_RADIUS))
+
+    def set_radius(self, radius):
+        """Move and scale the existing board items to the given radius."""
+        geometry = board_geometry(radius, self.devicePixelRatioF())
+        if geometry is self.layout_geometry:
+            return
+        self.layout_geometry = geometry
+        self.scene().setSceneRect(0, 0, 2 * radius, 2 * radius)
+        self.ellipse.setRect(0, 0, 2 * radius, 2 * radius)
+        self.ellipse.setBrush(QBrush(
+            background_image(round(radius / self.RADIUS, 2))
+        ))
+
+        for line, points in zip(self.boundaries, geometry.boundaries):
+            line.setLine(*points)
+            pen = line.pen()
+            pen.setWidth(geometry.line_width)
+            line.setPen(pen)
+
+        for label, (x, y) in zip(self.labels, geometry.labels):
+            font = label.font()
+            font.setPixelSize(geometry.label_size)
+            label.setFont(font)
+            label.setTransformOriginPoint(label.boundingRect().center())
+            _centre(label, x, y)
 
-    @staticmethod
-    def _boundary_angles():
-        """Return a list of angles on the boundaries between segments."""
-        return [2 * np.pi * i / len(SEGMENTS)
-                for i in range(len(SEGMENTS))]
+        for count, (x, y) in zip(self.counts.values(), geometry.counts):
+            font = count.font()
+            font.setPixelSize(geometry.count_size)
+            count.setFont(font)
+            _centre(count, x, y)
 
-    def _from_radial(self, r_frac, theta):
-        """Return Cartesian coordinates from radial specification."""
-        x = self.RADIUS + r_frac * self.RADIUS * np.cos(theta)
-        y = self.RADIUS + r_frac * self.RADIUS * np.sin(theta)
-        return x, y
+        for winner, (x, y) in zip(self.winners.values(), geometry.winners):
+            font = winner.font()
+            font.setPixelSize(geometry.winner_size)
+            winner.setFont(font)
+            winner.resize(winner.sizeHint())
+            winner.move(x, y)
 
     def _draw_background(self, scene):
-        """Draw the boundaries between adjacent segments."""
+        """Draw the board and the boundaries between adjacent segments."""
 
-        ellipse = scene.addEllipse(0, 0, 2 * self.RADIUS, 2 * self.RADIUS)
-        ellipse.setPen(QPen(QBrush(), 0))
-        ellipse.setBrush(QBrush(QImage(background_image_file())))
+        self.ellipse = scene.addEllipse(0, 0, 0, 0)
+        self.ellipse.setPen(QPen(QBrush(), 0))
 
         # Add segment boundaries
-        for theta in self._boundary_angles():
-            x1, y1 = self._from_radial(0.1, theta)
-            x2, y2 = self._from_radial(0.9, theta)
-            line = scene.addLine(x1, y1, x2, y2)
+        self.boundaries = []
+        for _ in SEGMENTS:
+            line = scene.addLine(0, 0, 0, 0)
             pen = line.pen()
             pen.setBrush(QBrush(QColor(0, 0, 0, 128)))
-            pen.setWidth(10)
             pen.setCapStyle(Qt.RoundCap)
             line.setPen(pen)
+            self.boundaries.append(line)
 
-        # Add segment name label
-        for theta, name in zip(self._segment_angles(), SEGMENTS):
-            x_name, y_name = self._from_radial(0.9, theta)
+        # Add segment name labels
+        self.labels = []
+        for i, name in enumerate(SEGMENTS):
             text = scene.addText(name)
             font = text.font()
             font.setWeight(QFont.Black)
-            font.setPixelSize(20)
             text.setFont(font)
             text.setDefaultTextColor(QColor(0, 0, 0, 128))
-            center = text.boundingRect().center()
-            text.setTransformOriginPoint(center)
-            text.setPos(x_name - center.x(), y_name - center.y())
-            text_angle = np.degrees(theta) % 180 - 90
-            text.setRotation(text_angle)
+            theta = 2 * np.pi * (i + 0.5) / len(SEGMENTS)
+            text.setRotation(np.degrees(theta) % 180 - 90)
+            self.labels.append(text)
 
     def _place_counts(self, scene):
         """Place and return a dict of counter counts."""
 
-        def place_count(theta):
-            x_count, y_count = self._from_radial(0.4, theta)
+        def place_count():
             count = scene.addText("0")
             font = count.font()
             font.setWeight(QFont.Black)
-            font.setPixelSize(40)
             count.setFont(font)
             count.setDefaultTextColor(QColor(0, 0, 0, 128))
-            center = count.boundingRect().center()
-            count.setPos(x_count - center.x(), y_count - center.y())
             return count
 
-        return OrderedDict(
-            (name, place_count(theta))
-            for name, theta in zip(SEGMENTS, self._segment_angles())
-        )
+        return OrderedDict((name, place_count()) for name in SEGMENTS)
 
     def _place_winners(self, scene, players):
         """Place and return a dict of winner selection boxes."""
         winners = OrderedDict(
             (name, Winner(players)) for name in SEGMENTS
         )
-        for winner, theta in zip(winners.values(), self._segment_angles()):
-            x_widget, y_widget = self._from_radial(0.7, theta)
+        for winner in winners.values():
             scene.addWidget(winner)
-            winner.move(x_widget, y_widget)
         return winners
 
     def refresh(self, phase, players, balance):
         """Refresh the board."""
 
         # Update segment counts
-        for segment, value in balance.items():
-            self.counts[segment].setPlainText(str(value))
+        for (segment, count), (x, y) in zip(self.counts.items(),
+                                            self.layout_geometry.counts):
+            count.setPlainText(str(balance[segment]))
+            _centre(count, x, y)
 
         for winner in self.winners.values():
 
@@ -0,0 +1,172 @@
+"""Images of the board at the end of each round."""
+import argparse
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QFont, QFontMetrics, QImage, QPainter
+from PyQt5.QtWidgets import QApplication
+
+from table.board import Board
+from table.scorer import LINKED_SEGMENTS
+from table.snapshot import dumps, loads
+
+SNAPSHOT_EXTENSION = ".pjs"
+RESULT_EXTENSION = ".json"
+
+# Pixel size of the text listing the cards left beneath the board
+CAPTION_SIZE = 16
+
+
+def render_board(board, player_cards=None):
+    """
+    Render the board's scene to an image, without displaying it.
+    :param player_cards:  A dict of the cards left in each hand, to write
+                          beneath the board
+    """
+    scene = board.scene()
+    rect = scene.sceneRect()
+    font = QFont()
+    font.setPixelSize(CAPTION_SIZE)
+    caption = 2 * QFontMetrics(font).height() if player_cards else 0
+    size = rect.size().toSize()
+    image = QImage(size.width(), size.height() + caption,
+                   QImage.Format_ARGB32_Premultiplied)
+    image.fill(0)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    scene.render(painter, QRectF(0, 0, size.width(), size.height()), rect)
+    if player_cards:
+        painter.setFont(font)
+        painter.drawText(
+            QRectF(0, size.height(), size.width(), caption), Qt.AlignCenter,
+            "Cards left: " + ", ".join(f"{player} {cards}" for player, cards
+                                       in player_cards.items())
+        )
+    painter.end()
+    return image
+
+
+def show_winners(board, segment_winners):
+    """Select the winner of each segment on the board."""
+    # Pairs select their honours' winners too, so are selected first
+    for segment in sorted(segment_winners,
+                          key=lambda s: s not in LINKED_SEGMENTS):
+        board.winners[segment].setCurrentText(segment_winners[segment])
+
+
+class BoardCapture:
+    """
+    Saves an image of the board and a snapshot of the game as each round's
+    results are entered, before the board is cleared, with the results
+    alongside.
+
+    The board is rendered on the GUI thread, but images are compressed and
+    written on a worker thread, so the table isn't held up.
+    """
+
+    def __init__(self, directory, queue_size=8, image_format="png"):
+        """
+        Initialise the worker thread.
+        :param directory:  The directory to write the session into
+        :param queue_size:  The number of rounds that may await writing
+                            before the table waits for the worker
+        :param image_format:  The image file format
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.image_format = image_format
+        self.game = 1
+        self.queue = queue.Queue(queue_size)
+        self.thread = threading.Thread(target=self._work, daemon=True)
+        self.thread.start()
+
+    def attach(self, table):
+        """Capture the board of a table view as each round is submitted."""
+        table.round_submitted.connect(
+            lambda segment_winners, player_cards: self.capture(
+                table.q_board, table.scorer, segment_winners, player_cards
+            )
+        )
+        table.game_started.connect(self.new_game)
+
+    def new_game(self):
+        """Number the rounds captured from now on as a new game."""
+        self.game += 1
+
+    def capture(self, board, scorer, segment_winners, player_cards):
+        """
+        Queue an image of the board, the state of the game and the results
+        of the round being scored.
+        """
+        name = f"game_{self.game:02d}_round_{scorer.round:04d}"
+        result = {"segment_winners": dict(segment_winners),
+                  "player_cards": dict(player_cards)}
+        self.queue.put((name, render_board(board, player_cards),
+                        dumps(scorer), result))
+
+    def _work(self):
+        """Write queued images and snapshots until closed."""
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            name, image, snapshot, result = item
+            path = os.path.join(self.directory, name)
+            with open(path + SNAPSHOT_EXTENSION, "wb") as f:
+                f.write(snapshot)
+            with open(path + RESULT_EXTENSION, "w") as f:
+                json.dump(result, f, indent=2)
+            image.save(f"{path}.{self.image_format}", self.image_format)
+
+    def close(self):
+        """Finish writing queued rounds and stop the worker thread."""
+        self.queue.put(None)
+        self.thread.join()
+
+
+def render_session(directory, image_format="png"):
+    """
+    Regenerate the images of every round in a captured session from the
+    stored snapshots and results, rendering to a hidden board.
+    :return:  The paths of the images written
+    """
+    board = board_players = None
+    written = []
+    for path in sorted(glob.glob(
+            os.path.join(directory, "*" + SNAPSHOT_EXTENSION))):
+        with open(path, "rb") as f:
+            scorer = loads(f.read())
+        players = list(scorer.balance.players)
+        if board is None or players != board_players:
+            board, board_players = Board(players, lambda _: None), players
+        board.refresh(scorer.phase, scorer.players, scorer.balance.segments)
+        result_path = os.path.splitext(path)[0] + RESULT_EXTENSION
+        player_cards = None
+        if os.path.exists(result_path):
+            with open(result_path) as f:
+                result = json.load(f)
+            show_winners(board, result["segment_winners"])
+            player_cards = result["player_cards"]
+        image_path = f"{os.path.splitext(path)[0]}.{image_format}"
+        render_board(board, player_cards).save(image_path, image_format)
+        written.append(image_path)
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Regenerate board images for a captured session"
+    )
+    parser.add_argument("directory")
+    parser.add_argument("--format", default="png")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    App = QApplication(sys.argv[:1])
+    for path in render_session(args.directory, args.format):
+        print(path)
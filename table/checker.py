@@ -0,0 +1,354 @@
+"""Randomised invariant checking of the scorer against a reference model."""
+import argparse
+import os
+import random
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from table import ledger
+from table.scorer import LINKED_SEGMENTS, Phase, SEGMENTS, Scorer
+
+# Actions, referring to players by their seat
+Dress = namedtuple("Dress", [])
+Score = namedtuple("Score", ["winners", "cards"])
+Drop = namedtuple("Drop", ["seat"])
+
+# A sequence of actions breaking an invariant
+Failure = namedtuple("Failure", ["starting_value", "n_players", "actions",
+                                 "step", "message"])
+
+_STAKES = list(SEGMENTS.values())
+_GAME = list(SEGMENTS).index("Game")
+
+
+class ReferenceModel:
+    """An independent model of the scoring rules, tracked by seat."""
+
+    def __init__(self, starting_value, n_players):
+        """Initialise a new game."""
+        self.balances = [starting_value] * n_players
+        self.pots = [0] * len(_STAKES)
+        self.active = [True] * n_players
+        self.round = 1
+        self.scoring = False
+        self.dresser = 0
+
+    def next_active(self, seat):
+        """Return the next player still in the game after the given seat."""
+        n_players = len(self.active)
+        for offset in range(1, n_players + 1):
+            if self.active[(seat + offset) % n_players]:
+                return (seat + offset) % n_players
+
+    def is_legal(self, action):
+        """Return whether the action could be taken through the table."""
+        if isinstance(action, Dress):
+            return not self.scoring
+        if isinstance(action, Score):
+            return self.scoring and all(
+                seat is None or self.active[seat] for seat in action.winners
+            ) and action.winners[_GAME] is not None
+        if isinstance(action, Drop):
+            must_dress = action.seat == self.dresser and not self.scoring
+            balance = self.balances[action.seat]
+            return (self.active[action.seat] and sum(self.active) > 1
+                    and ((must_dress and balance < sum(_STAKES))
+                         or balance < 0))
+        return False
+
+    def apply(self, action):
+        """Apply a legal action."""
+        if isinstance(action, Dress):
+            self.balances[self.dresser] -= sum(_STAKES)
+            self.pots = [pot + stake for pot, stake in zip(self.pots,
+                                                           _STAKES)]
+            self.scoring = True
+        elif isinstance(action, Score):
+            for segment, seat in enumerate(action.winners):
+                if seat is not None:
+                    self.balances[seat] += self.pots[segment]
+                    self.pots[segment] = 0
+            for seat, cards in enumerate(action.cards):
+                self.balances[seat] -= cards
+                self.balances[action.winners[_GAME]] += cards
+            self.scoring = False
+            self.round += 1
+            self.dresser = self.next_active(self.dresser)
+        else:
+            self.active[action.seat] = False
+            if action.seat == self.dresser and not self.scoring:
+                self.dresser = self.next_active(self.dresser)
+
+
+def random_actions(rng, starting_value, n_players, length):
+    """Generate a random sequence of legal actions."""
+    model = ReferenceModel(starting_value, n_players)
+    segments = list(SEGMENTS)
+    actions = []
+    while len(actions) < length:
+        seats = [s for s in range(n_players) if model.active[s]]
+        droppable = [Drop(s) for s in seats if model.is_legal(Drop(s))]
+        if droppable and rng.random() < 0.5:
+            action = rng.choice(droppable)
+        elif not model.scoring:
+            action = Dress()
+        else:
+            winners = {s: rng.choice(seats) if rng.random() < 0.4 else None
+                       for s in segments}
+            winners["Game"] = rng.choice(seats)
+            for segment, linked in LINKED_SEGMENTS.items():
+                if winners[segment] is not None:
+                    winners.update((s, winners[segment]) for s in linked)
+            cards = [rng.randrange(14) if model.active[s] else 0
+                     for s in range(n_players)]
+            action = Score(tuple(winners[s] for s in segments), tuple(cards))
+        model.apply(action)
+        actions.append(action)
+    return actions
+
+
+def _check_invariants(scorer, model, before, action, total, names, seats):
+    """Return a description of any broken invariant, or None."""
+    balance = scorer.balance
+    if sum(balance.players.values()) + sum(balance.segments.values()) \
+            != total:
+        return "Counters are not conserved"
+    if any(value < 0 for value in balance.segments.values()):
+        return "A segment holds negative counters"
+    if scorer.dresser not in scorer.players and \
+            scorer.phase == Phase.DRESSING:
+        return f"Dresser {scorer.dresser} is not in the game"
+    if not isinstance(action, Drop):
+        if scorer.phase != before.phase.next():
+            return f"Phase did not alternate from {before.phase.name}"
+        expected_round = before.round + isinstance(action, Score)
+        if scorer.round != expected_round:
+            return f"Round {scorer.round}, expected {expected_round}"
+    if isinstance(action, Score):
+        n_players = len(names)
+        previous = seats[before.dresser]
+        for offset in range(1, n_players + 1):
+            expected = names[(previous + offset) % n_players]
+            if expected in scorer.players:
+                break
+        if scorer.dresser != expected:
+            return f"Dresser passed to {scorer.dresser}, expected {expected}"
+
+    # Compare with the reference model
+    if model is not None and not _same_as_model(scorer, model, names, seats):
+        state = (
+            model.round,
+            Phase.SCORING if model.scoring else Phase.DRESSING,
+            names[model.dresser],
+            [names[s] for s in range(len(names)) if model.active[s]],
+            dict(zip(names, model.balances)),
+            dict(zip(SEGMENTS, model.pots)),
+        )
+        actual = (scorer.round, scorer.phase, scorer.dresser,
+                  list(scorer.players), dict(balance.players),
+                  dict(balance.segments))
+        return f"Scorer state {actual} differs from reference {state}"
+    return None
+
+
+def _same_as_model(scorer, model, names, seats):
+    """Return whether the scorer's state matches the reference model."""
+    if scorer.round != model.round or \
+            (scorer.phase == Phase.SCORING) != model.scoring or \
+            scorer.dresser != names[model.dresser]:
+        return False
+    # The players still in the game, in seating order
+    players = scorer.players
+    if len(players) != sum(model.active):
+        return False
+    previous = -1
+    for name in players:
+        seat = seats[name]
+        if seat <= previous or not model.active[seat]:
+            return False
+        previous = seat
+
+    balance = scorer.balance
+    for name, value in zip(names, model.balances):
+        if balance.players[name] != value:
+            return False
+    for segment, pot in zip(SEGMENTS, model.pots):
+        if balance.segments[segment] != pot:
+            return False
+    return True
+
+
+def _check_ledger(scorer):
+    """Return a description of any disagreement with the ledger, or None."""
+    balance = scorer.balance
+    accounts = [
+        *((ledger.player(p), v) for p, v in balance.players.items()),
+        *((ledger.segment(s), v) for s, v in balance.segments.items()),
+    ]
+    if any(scorer.ledger.balance(account, scorer.round) != value
+           for account, value in accounts):
+        return "Ledger balances differ from the scorer"
+    return None
+
+
+_State = namedtuple("_State", ["round", "phase", "dresser"])
+
+
+def check_actions(starting_value, n_players, actions, reference=True):
+    """
+    Apply a sequence of actions to a scorer, skipping any that are illegal,
+    and check the invariants after each step.  The ledger is only checked
+    against the scorer's balances at the end, as it is slower to query.
+    :return:  The step and description of the first broken invariant, or
+              None if all invariants hold
+    """
+    names = [f"Player{i}" for i in range(n_players)]
+    seats = {name: seat for seat, name in enumerate(names)}
+    scorer = Scorer(starting_value, list(names))
+    model = ReferenceModel(starting_value, n_players)
+    total = starting_value * n_players
+    segments = list(SEGMENTS)
+    last = None
+    for step, action in enumerate(actions):
+        if not model.is_legal(action):
+            continue
+        last = step
+        before = _State(scorer.round, scorer.phase, scorer.dresser)
+        try:
+            if isinstance(action, Dress):
+                scorer.log_dress(scorer.dresser)
+            elif isinstance(action, Score):
+                scorer.log_round(
+                    {s: "" if seat is None else names[seat]
+                     for s, seat in zip(segments, action.winners)},
+                    dict(zip(names, action.cards)),
+                )
+            else:
+                scorer.drop(names[action.seat])
+        except Exception as error:
+            return step, f"{type(error).__name__}: {error}"
+        model.apply(action)
+        message = _check_invariants(scorer, model if reference else None,
+                                    before, action, total, names, seats)
+        if message:
+            return step, message
+    if last is not None:
+        message = _check_ledger(scorer)
+        if message:
+            return last, message
+    return None
+
+
+def shrink(starting_value, n_players, actions, reference=True):
+    """
+    Reduce a failing sequence of actions to a minimal one that still fails,
+    by repeatedly removing chunks of actions.
+    """
+    def fails(candidate):
+        return check_actions(starting_value, n_players, candidate,
+                             reference) is not None
+
+    chunk = len(actions) // 2
+    while chunk >= 1:
+        start = 0
+        while start < len(actions):
+            candidate = actions[:start] + actions[start + chunk:]
+            if fails(candidate):
+                actions = candidate
+            else:
+                start += chunk
+        chunk //= 2
+
+    # Simplify the remaining scoring actions
+    for i, action in enumerate(actions):
+        if isinstance(action, Score):
+            simpler = Score(
+                tuple(seat if s == _GAME else None
+                      for s, seat in enumerate(action.winners)),
+                tuple(0 for _ in action.cards),
+            )
+            candidate = actions[:i] + [simpler] + actions[i + 1:]
+            if fails(candidate):
+                actions = candidate
+    return actions
+
+
+def _check_shard(seed, n_sequences, length, reference):
+    """Check a shard of random sequences, returning the first failure."""
+    rng = random.Random(seed)
+    for _ in range(n_sequences):
+        n_players = rng.randint(1, 8)
+        starting_value = rng.randint(0, 60)
+        actions = random_actions(rng, starting_value, n_players, length)
+        result = check_actions(starting_value, n_players, actions, reference)
+        if result:
+            return Failure(starting_value, n_players, actions, *result)
+    return None
+
+
+def check(n_sequences=10000, length=50, seed=None, reference=True,
+          workers=None, shards=None):
+    """
+    Check random legal sequences of actions against the scorer, sharded over
+    a pool of processes.
+    :return:  A shrunk failure, or None if no invariant was broken
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = shards or 4 * workers
+    rng = random.Random(seed)
+    sizes = [n_sequences // shards + (i < n_sequences % shards)
+             for i in range(shards)]
+    seeds = [rng.getrandbits(64) for _ in sizes]
+    args = [(s, size, length, reference) for s, size in zip(seeds, sizes)]
+    if workers == 1:
+        failure = next((r for r in (_check_shard(*a) for a in args) if r),
+                       None)
+    else:
+        with ProcessPoolExecutor(workers) as executor:
+            futures = [executor.submit(_check_shard, *a) for a in args]
+            try:
+                # Take the first failing shard in order, so a seeded check
+                # always reports the same failure
+                failure = next((r for r in (f.result() for f in futures)
+                                if r), None)
+            finally:
+                # Leave only the shards already running to finish
+                for future in futures:
+                    future.cancel()
+    if failure is None:
+        return None
+    actions = shrink(failure.starting_value, failure.n_players,
+                     failure.actions, reference)
+    step, message = check_actions(failure.starting_value, failure.n_players,
+                                  actions, reference)
+    return failure._replace(actions=actions, step=step, message=message)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        epilog="Each core checks roughly 450 sequences of 50 actions per "
+               "second, and the sequences are split between every core, so a "
+               "million sequences take about 35 minutes on one core, or about "
+               "5 minutes on eight."
+    )
+    parser.add_argument("--sequences", type=int, default=100000)
+    parser.add_argument("--length", type=int, default=50)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--no-reference", dest="reference",
+                        action="store_false",
+                        help="Only check invariants, not the reference model")
+    args = parser.parse_args()
+
+    failure = check(args.sequences, args.length, args.seed, args.reference,
+                    args.workers)
+    if failure is None:
+        print(f"Checked {args.sequences} sequences without failure")
+    else:
+        print(f"{failure.message}, after step {failure.step} of a game "
+              f"with {failure.n_players} players starting on "
+              f"{failure.starting_value}:")
+        for action in failure.actions[:failure.step + 1]:
+            print(f"  {action}")
+        raise SystemExit(1)
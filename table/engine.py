@@ -0,0 +1,295 @@
+"""Play out dealt hands of Pope Joan."""
+import copy
+import random
+
+from table.scorer import LINKED_SEGMENTS, SEGMENTS
+
+SUITS = ("C", "D", "H", "S")
+RANKS = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K")
+DIAMONDS = SUITS.index("D")
+ACE, JACK, QUEEN, KING = (RANKS.index(r) for r in ("A", "J", "Q", "K"))
+
+
+def card(rank, suit):
+    """Return the integer encoding of a card."""
+    return suit * len(RANKS) + rank
+
+
+POPE = card(RANKS.index("9"), DIAMONDS)
+REMOVED = card(RANKS.index("8"), DIAMONDS)
+DECK = tuple(c for c in range(len(SUITS) * len(RANKS)) if c != REMOVED)
+
+RANK = tuple(c % len(RANKS) for c in range(len(SUITS) * len(RANKS)))
+SUIT = tuple(c // len(RANKS) for c in range(len(SUITS) * len(RANKS)))
+NAMES = tuple(RANKS[RANK[c]] + SUITS[SUIT[c]]
+              for c in range(len(SUITS) * len(RANKS)))
+
+# The card following each card in a sequence, or NO_CARD at a fixed stop
+NO_CARD = -1
+NEXT = tuple(NO_CARD if RANK[c] == KING or c + 1 == REMOVED else c + 1
+             for c in range(len(SUITS) * len(RANKS)))
+
+# Owners of cards not in a player's hand
+WIDOW = -1
+PLAYED = -2
+
+HONOURS = {ACE: "Ace", JACK: "Jack", QUEEN: "Queen", KING: "King"}
+
+
+def card_name(c):
+    """Return a short name for a card, e.g. '9D'."""
+    return NAMES[c]
+
+
+def parse_card(name):
+    """Return the card with the given short name."""
+    return NAMES.index(name.upper())
+
+
+def parse_cards(*names):
+    """Return the cards with the given short names."""
+    return [parse_card(name) for name in names]
+
+
+def turned_up(trump_card):
+    """Return the segments the dealer wins with the card turned up."""
+    if trump_card == POPE:
+        # The hand is not played when the Pope is turned up
+        return ["9 Diamonds", "Game"]
+    if RANK[trump_card] in HONOURS:
+        return [HONOURS[RANK[trump_card]]]
+    return []
+
+
+def segments_won(c, trumps, honours):
+    """
+    Return the segments won by playing a card.
+    :param c:  The card played
+    :param trumps:  The trump suit
+    :param honours:  A set of the trump honours played by the same player,
+                     including the card played
+    """
+    if c == POPE:
+        return ["9 Diamonds"]
+    if SUIT[c] != trumps or RANK[c] not in HONOURS:
+        return []
+    honour = HONOURS[RANK[c]]
+    # A pair is won by playing both honours, in either order
+    return [honour] + [pair for pair, linked in LINKED_SEGMENTS.items()
+                       if honour in linked and honours.issuperset(linked)]
+
+
+def cards_owed(trump_card, cards):
+    """Return the number of cards a player pays for, of those left in hand."""
+    if trump_card == POPE or POPE in cards:
+        # Nothing is owed when the Pope is turned up, and a player holding
+        # the Pope is excused from paying
+        return 0
+    return len(cards)
+
+
+def round_result(players, hands, played, trump_card, dealer):
+    """
+    Return the segment winners and cards left in each player's hand, as
+    required by the scorer, from the cards played and left in each hand.
+    :param players:  The players in the round
+    :param hands:  A dict of the cards left in each player's hand
+    :param played:  A dict of the trump honours and Pope each player played
+    :param trump_card:  The card turned up to decide trumps
+    :param dealer:  The player who dealt, and wins anything turned up
+    """
+    segment_winners = dict.fromkeys(SEGMENTS, "")
+    for segment in turned_up(trump_card):
+        segment_winners[segment] = dealer
+    if trump_card != POPE:
+        trumps = SUIT[trump_card]
+        for player in players:
+            honours = set()
+            for c in played.get(player, ()):
+                if SUIT[c] == trumps and RANK[c] in HONOURS:
+                    honours.add(HONOURS[RANK[c]])
+                for segment in segments_won(c, trumps, honours):
+                    segment_winners[segment] = player
+
+        out = [player for player in players if not hands.get(player)]
+        if len(out) != 1:
+            raise ValueError(f"Expected one player out of cards, found {out}")
+        segment_winners["Game"] = out[0]
+
+    player_cards = {player: cards_owed(trump_card, hands.get(player, ()))
+                    for player in players}
+    return segment_winners, player_cards
+
+
+class Hand:
+    """The state of play of a dealt hand."""
+
+    def __init__(self, hands, widow, trump_card, dealer):
+        """
+        Initialise from the dealt cards.
+        :param hands:  A list of the cards held by each seat
+        :param widow:  The cards in the extra, unplayed hand
+        :param trump_card:  The card turned up to decide trumps
+        :param dealer:  The seat of the dealer
+        """
+        self.hands = [set(cards) for cards in hands]
+        self.owner = [PLAYED] * len(NEXT)
+        for c in widow:
+            self.owner[c] = WIDOW
+        for seat, cards in enumerate(self.hands):
+            for c in cards:
+                self.owner[c] = seat
+        self.trump_card = trump_card
+        self.trumps = SUIT[trump_card]
+        self.dealer = dealer
+        self.leader = (dealer + 1) % len(hands)
+        self.winners = {segment: None for segment in SEGMENTS}
+        self.honours_played = {}
+        self.played = []
+        # Cards seen to stop a sequence, so known to be in the widow
+        self.known_widow = set()
+
+        # The dealer wins anything turned up
+        for segment in turned_up(trump_card):
+            self.winners[segment] = dealer
+
+    @property
+    def finished(self):
+        """Whether the game has been won."""
+        return self.winners["Game"] is not None
+
+    def legal_leads(self):
+        """Return the cards the leader may start a sequence with."""
+        return sorted(self.hands[self.leader])
+
+    def _play(self, seat, c):
+        """Play a single card from a seat's hand."""
+        self.hands[seat].remove(c)
+        self.owner[c] = PLAYED
+        self.played.append(c)
+        if c == POPE or SUIT[c] == self.trumps and RANK[c] in HONOURS:
+            if c != POPE:
+                self.honours_played[HONOURS[RANK[c]]] = seat
+            honours = {h for h, s in self.honours_played.items() if s == seat}
+            for segment in segments_won(c, self.trumps, honours):
+                self.winners[segment] = seat
+
+    def lead(self, c):
+        """
+        Lead a card, then play out the sequence until it reaches a stop,
+        when the last player to play leads next.
+        """
+        seat = self.leader
+        while True:
+            self._play(seat, c)
+            if not self.hands[seat]:
+                self.winners["Game"] = seat
+                return
+            c = NEXT[c]
+            if c == NO_CARD or self.owner[c] == PLAYED:
+                break
+            if self.owner[c] == WIDOW:
+                self.known_widow.add(c)
+                break
+            seat = self.owner[c]
+        self.leader = seat
+
+    def copy(self):
+        """Return an independent copy of the state of play."""
+        other = copy.copy(self)
+        other.hands = [set(cards) for cards in self.hands]
+        other.owner = list(self.owner)
+        other.winners = dict(self.winners)
+        other.honours_played = dict(self.honours_played)
+        other.played = list(self.played)
+        other.known_widow = set(self.known_widow)
+        return other
+
+    def play(self, policies):
+        """
+        Play until the game is won.
+        :param policies:  A policy for each seat, called with the hand and
+                          the seat to choose a card to lead
+        """
+        while not self.finished:
+            self.lead(policies[self.leader](self, self.leader))
+
+    def result(self, players):
+        """
+        Return the segment winners and cards left in each player's hand, as
+        required by the scorer.
+        :param players:  The name of the player in each seat
+        """
+        played = {name: [] for name in players}
+        for rank, honour in HONOURS.items():
+            if honour in self.honours_played:
+                played[players[self.honours_played[honour]]].append(
+                    card(rank, self.trumps)
+                )
+        if POPE in self.played:
+            played[players[self.winners["9 Diamonds"]]].append(POPE)
+        return round_result(players, dict(zip(players, self.hands)), played,
+                            self.trump_card, players[self.dealer])
+
+
+def deal(n_players, dealer=0, rng=random):
+    """
+    Deal a hand, including an extra widow hand whose last card is turned up
+    to decide trumps.
+    """
+    deck = list(DECK)
+    rng.shuffle(deck)
+    n_hands = n_players + 1
+    first = (dealer + 1) % n_players
+    hands = [deck[(i - first) % n_players:-1:n_hands]
+             for i in range(n_players)]
+    widow = deck[n_players:-1:n_hands] + deck[-1:]
+    return Hand(hands, widow, deck[-1], dealer)
+
+
+def lowest_card(hand, seat):
+    """Policy leading the lowest ranked card in hand."""
+    return min(hand.hands[seat], key=RANK.__getitem__)
+
+
+def longest_run(hand, seat):
+    """Policy leading the card starting the longest run held in hand."""
+    owner = hand.owner
+
+    def run(c):
+        length = 1
+        c = NEXT[c]
+        while c != NO_CARD and owner[c] == seat:
+            length += 1
+            c = NEXT[c]
+        return length
+
+    return max(hand.hands[seat], key=run)
+
+
+class RandomPolicy:
+    """Policy leading a card chosen at random."""
+
+    def __init__(self, rng=random):
+        """Initialise with a random number generator."""
+        self.rng = rng
+
+    def __call__(self, hand, seat):
+        """Choose a card to lead."""
+        return self.rng.choice(tuple(hand.hands[seat]))
+
+
+def play_round(players, dealer, policies=None, rng=random):
+    """
+    Deal and play a hand, returning the segment winners and cards left in
+    each player's hand, as required by the scorer.
+    :param players:  The players in seating order
+    :param dealer:  The player dressing the board and dealing
+    :param policies:  A dict of policies by player, defaulting to leading
+                      the lowest card
+    :param rng:  The random number generator used to deal
+    """
+    policies = policies or {}
+    hand = deal(len(players), players.index(dealer), rng)
+    hand.play([policies.get(p, lowest_card) for p in players])
+    return hand.result(players)
@@ -0,0 +1,239 @@
+"""A live feed of the game state in shared memory, for local displays."""
+import argparse
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from table.snapshot import dumps, loads
+
+MAGIC = b"PJLF"
+VERSION = 2
+
+# Space for the snapshot, ample for any realistic table
+CAPACITY = 1 << 16
+
+# Seconds a reader waits for an update to complete, after which the
+# publisher is taken to have stopped partway through it
+TIMEOUT = 1.0
+
+# magic, version, whether the feed is closed, sequence number, snapshot
+# length, and the number of times a publisher has opened the feed.  The
+# sequence number is 8-byte aligned, so it is written in a single store.
+_HEADER = struct.Struct("<4sB?2xQII")
+_CLOSED_OFFSET = 5
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+_LENGTH = struct.Struct("<I")
+_LENGTH_OFFSET = 16
+_EPOCH = struct.Struct("<I")
+_EPOCH_OFFSET = 20
+
+
+class FeedError(ValueError):
+    """Raised when shared memory does not hold a readable feed."""
+
+
+def feed_path(name):
+    """
+    Return the path of the file backing a named feed, in memory where the
+    system provides a filesystem for it.
+    """
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") \
+        else tempfile.gettempdir()
+    return os.path.join(directory, f"pope-joan-{name}")
+
+
+class FeedPublisher:
+    """
+    Publishes the state of a game to a named feed, a file mapped into the
+    memory of the publisher and each reader.
+
+    Updates use a sequence lock: the sequence number is made odd while the
+    snapshot is written and even once it is complete, so readers can detect
+    and retry a read that overlapped a write.  The publisher never waits for
+    readers, so the table is never held up by them.
+
+    A feed left behind by a publisher that stopped without closing it is
+    reused rather than truncated, since readers may still have it mapped,
+    and its sequence numbers carried on.
+    """
+
+    def __init__(self, name, capacity=CAPACITY):
+        """
+        Create the feed, or reopen one left behind.
+        :param name:  The name of the feed
+        :param capacity:  The largest snapshot that can be published
+        """
+        self.path = feed_path(name)
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(descriptor, "rb+") as f:
+            header = f.read(_HEADER.size).ljust(_HEADER.size, b"\0")
+            # Never shrink the file, which readers may have mapped
+            size = max(os.fstat(f.fileno()).st_size, _HEADER.size + capacity)
+            f.truncate(size)
+            self.memory = mmap.mmap(f.fileno(), 0)
+        self.capacity = size - _HEADER.size
+
+        magic, version, _, sequence, length, epoch = _HEADER.unpack(header)
+        if (magic, version) != (MAGIC, VERSION):
+            sequence = length = epoch = 0
+        # An odd sequence number, from a publisher stopped partway through an
+        # update, is left for the next update to replace
+        self.sequence = sequence + sequence % 2
+        _HEADER.pack_into(self.memory, 0, MAGIC, VERSION, False, sequence,
+                          length, epoch + 1)
+
+    def attach(self, table):
+        """Publish the state of a table view whenever it is refreshed."""
+        table.refreshed.connect(lambda: self.publish(table.scorer))
+        self.publish(table.scorer)
+
+    def publish(self, scorer):
+        """Publish the state of a scorer."""
+        snapshot = dumps(scorer)
+        if len(snapshot) > self.capacity:
+            raise ValueError(f"Snapshot of {len(snapshot)} bytes exceeds "
+                             f"the feed capacity of {self.capacity}")
+        memory = self.memory
+        _SEQUENCE.pack_into(memory, _SEQUENCE_OFFSET, self.sequence + 1)
+        memory[_HEADER.size:_HEADER.size + len(snapshot)] = snapshot
+        _LENGTH.pack_into(memory, _LENGTH_OFFSET, len(snapshot))
+        self.sequence += 2
+        _SEQUENCE.pack_into(memory, _SEQUENCE_OFFSET, self.sequence)
+
+    def close(self):
+        """Mark the feed closed for readers, and remove it."""
+        self.memory[_CLOSED_OFFSET] = True
+        self.memory.close()
+        os.remove(self.path)
+
+
+class FeedReader:
+    """
+    Reads the latest state of a game from a publisher's feed.
+
+    Snapshots are decoded in place from the shared memory, without locking
+    or copying it.  The feed is mapped again whenever its publisher closes
+    or reopens it, so a reader follows the table across restarts.
+    """
+
+    def __init__(self, name, timeout=TIMEOUT):
+        """
+        Map a publisher's feed into memory.
+        :param name:  The name of the feed
+        :param timeout:  Seconds to wait for an update to complete
+        """
+        self.name = name
+        self.timeout = timeout
+        self.memory = None
+        self._map()
+
+    def _map(self):
+        """Map the feed into memory, in place of any earlier mapping."""
+        with open(feed_path(self.name), "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            try:
+                memory = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise FeedError(f"Feed {self.name} is empty")
+        try:
+            magic, version, _, _, _, epoch = _HEADER.unpack_from(memory)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC:
+            memory.close()
+            raise FeedError(f"{self.name} is not a feed")
+        if version != VERSION:
+            memory.close()
+            raise FeedError(f"Unsupported feed version {version}")
+        if self.memory is not None:
+            self.memory.close()
+        self.memory, self.inode, self.epoch = memory, inode, epoch
+        # Sequence numbers already read may be reused by a new publisher
+        self._remapped = True
+
+    def _replaced(self):
+        """Return whether the feed has been closed or reopened."""
+        epoch, = _EPOCH.unpack_from(self.memory, _EPOCH_OFFSET)
+        if self.memory[_CLOSED_OFFSET] or epoch != self.epoch:
+            return True
+        try:
+            return os.stat(feed_path(self.name)).st_ino != self.inode
+        except FileNotFoundError:
+            return False
+
+    @property
+    def sequence(self):
+        """The sequence number of the latest state, even once complete."""
+        return _SEQUENCE.unpack_from(self.memory, _SEQUENCE_OFFSET)[0]
+
+    def read(self, since=None):
+        """
+        Return the latest state, retrying any read that overlaps an update.
+        :param since:  A sequence number already read, to return None
+                       unless the state has changed since
+        :return:  The sequence number and scorer, or None if nothing new has
+                  been published, the feed is closed, or its publisher
+                  stopped partway through an update
+        """
+        if self._replaced():
+            try:
+                self._map()
+            except (OSError, FeedError):
+                # Wait for a new publisher
+                return None
+        deadline = None
+        while True:
+            sequence = self.sequence
+            if sequence % 2:
+                if deadline is None:
+                    deadline = time.monotonic() + self.timeout
+                elif time.monotonic() > deadline:
+                    return None
+                time.sleep(0)
+                continue
+            if sequence == 0 or sequence == since and not self._remapped:
+                return None
+            try:
+                length, = _LENGTH.unpack_from(self.memory, _LENGTH_OFFSET)
+                with memoryview(self.memory) as view:
+                    scorer = loads(view[:_HEADER.size + length],
+                                   _HEADER.size)
+            except ValueError:
+                # A torn read may not decode, but must be retried if so
+                if self.sequence == sequence:
+                    raise
+                continue
+            if self.sequence == sequence:
+                self._remapped = False
+                return sequence, scorer
+
+    def close(self):
+        """Unmap the feed."""
+        self.memory.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Print the live state of a game as it changes"
+    )
+    parser.add_argument("name", help="The name of the feed")
+    parser.add_argument("--interval", type=float, default=0.1,
+                        help="Seconds between polls")
+    args = parser.parse_args()
+
+    reader = FeedReader(args.name)
+    latest = None
+    try:
+        while True:
+            update = reader.read(latest)
+            if update is not None:
+                latest, scorer = update
+                balances = ", ".join(f"{player} {value}" for player, value
+                                     in scorer.balance.players.items())
+                print(f"{scorer.title}: {balances}", flush=True)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        reader.close()
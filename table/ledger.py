@@ -0,0 +1,178 @@
+"""A double-entry ledger of the counters transferred during a game."""
+import threading
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+# Kinds of account: players, segments of the board, and the bank issuing the
+# counters each player starts with
+PLAYER = "player"
+SEGMENT = "segment"
+BANK = ("bank", "")
+
+Transfer = namedtuple("Transfer", ["round", "source", "destination", "amount"])
+
+
+def player(name):
+    """Return the account of a player."""
+    return PLAYER, name
+
+
+def segment(name):
+    """Return the account of a segment."""
+    return SEGMENT, name
+
+
+class Ledger:
+    """
+    Records every transfer of counters between accounts, with the round in
+    which it was made.
+
+    Transfers are kept in compact arrays, one per field, and indexed by round
+    in a Fenwick tree of the net flow into each account.  Each ordered pair
+    of accounts keeps running totals only for the rounds in which it made
+    transfers, so balances and flows over any range of rounds are found in
+    O(log rounds) time however long the game, in space growing with the
+    transfers made rather than the number of pairs.  Transfers must be
+    recorded in order of round.  Recording and querying take a lock of their
+    own, held only briefly.
+    """
+
+    def __init__(self, players, segments, capacity=64):
+        """
+        Initialise the accounts, with their opening balances paid from the
+        bank in round 0.
+        :param players:  A dict of each player's opening balance
+        :param segments:  A dict of each segment's opening balance
+        :param capacity:  The number of rounds initially indexed, rounded up
+                          to a power of two and doubled as needed
+        """
+        self.accounts = [BANK] + [player(p) for p in players] + \
+            [segment(s) for s in segments]
+        self._index = {a: i for i, a in enumerate(self.accounts)}
+        self._lock = threading.Lock()
+        self._transfers = Transfer(array("i"), array("H"), array("H"),
+                                   array("q"))
+        # Growing by doubling relies on the capacity being a power of two
+        self._capacity = 1 << max(capacity - 1, 0).bit_length()
+        self._flows = [self._tree() for _ in self.accounts]
+        # The rounds in which each pair of accounts made transfers, and the
+        # running total transferred by the end of each
+        self._pairs = {}
+        self._round = 0
+
+        for account, balance in [*((player(p), b) for p, b in players.items()),
+                                 *((segment(s), b) for s, b in
+                                   segments.items())]:
+            if balance:
+                self.record(0, BANK, account, balance)
+
+    def _tree(self):
+        """Return an empty Fenwick tree, indexed from 1."""
+        return array("q", bytes(8 * (self._capacity + 1)))
+
+    def _grow(self, round_):
+        """Index enough rounds to include the given one."""
+        capacity = self._capacity
+        while capacity < round_ + 1:
+            capacity *= 2
+        # The node at each new power of two covers all earlier rounds, and
+        # the other new nodes only rounds with no transfers yet
+        for tree in self._flows:
+            size = self._capacity
+            tree.frombytes(bytes(8 * (capacity - size)))
+            while size < capacity:
+                size *= 2
+                tree[size] = tree[size // 2]
+        # Growing by doubling relies on the capacity being a power of two
+        self._capacity = 1 << max(capacity - 1, 0).bit_length()
+
+    def record(self, round_, source, destination, amount):
+        """Record a transfer of counters from one account to another."""
+        if source == destination:
+            raise ValueError(f"Transfer from {source} to itself")
+        s, d = self._index[source], self._index[destination]
+        with self._lock:
+            if round_ < self._round:
+                raise ValueError(f"Transfer in round {round_} after round "
+                                 f"{self._round}")
+            self._round = round_
+            if round_ + 1 > self._capacity:
+                self._grow(round_)
+            transfers = self._transfers
+            transfers.round.append(round_)
+            transfers.source.append(s)
+            transfers.destination.append(d)
+            transfers.amount.append(amount)
+
+            pair = self._pairs.get((s, d))
+            if pair is None:
+                pair = self._pairs[s, d] = (array("i"), array("q"))
+            rounds, totals = pair
+            if rounds and rounds[-1] == round_:
+                totals[-1] += amount
+            else:
+                rounds.append(round_)
+                totals.append(totals[-1] + amount if totals else amount)
+
+            into, out_of = self._flows[d], self._flows[s]
+            i = round_ + 1
+            while i <= self._capacity:
+                into[i] += amount
+                out_of[i] -= amount
+                i += i & -i
+
+    def _prefix(self, tree, round_):
+        """Return the sum of a tree over rounds up to the given one."""
+        total = 0
+        i = min(round_ + 1, self._capacity)
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _range(self, tree, first, last):
+        """Return the sum of a tree over a range of rounds."""
+        return self._prefix(tree, last) - self._prefix(tree, first - 1)
+
+    def _transferred(self, s, d, first, last):
+        """
+        Return the counters transferred from one account to another over a
+        range of rounds, by their indices.
+        """
+        rounds, totals = self._pairs.get((s, d), ((), ()))
+        start = bisect_right(rounds, first - 1)
+        end = bisect_right(rounds, last)
+        return (totals[end - 1] if end else 0) - \
+            (totals[start - 1] if start else 0)
+
+    def balance(self, account, round_):
+        """Return the balance of an account at the end of a round."""
+        with self._lock:
+            return self._prefix(self._flows[self._index[account]], round_)
+
+    def flow(self, account, first, last):
+        """Return the net counters into an account over a range of rounds."""
+        with self._lock:
+            return self._range(self._flows[self._index[account]], first, last)
+
+    def net(self, source, destination, first, last):
+        """
+        Return the net counters transferred from one account to another over
+        a range of rounds, including both the first and last.
+        """
+        s, d = self._index[source], self._index[destination]
+        with self._lock:
+            return self._transferred(s, d, first, last) - \
+                self._transferred(d, s, first, last)
+
+    def __len__(self):
+        """Return the number of transfers recorded."""
+        return len(self._transfers.amount)
+
+    def __iter__(self):
+        """Iterate over the transfers in the order recorded."""
+        with self._lock:
+            transfers = list(zip(*self._transfers))
+        for round_, s, d, amount in transfers:
+            yield Transfer(round_, self.accounts[s], self.accounts[d], amount)
@@ -1,7 +1,8 @@
 """Entry point for the application."""
+import argparse
 import sys
 
-from PyQt5.QtGui import QIcon
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication,
     QDialog,
@@ -12,33 +13,81 @@ from PyQt5.QtWidgets import (
 )
 
 from table.board import Board
+from table.capture import BoardCapture
 from table.config import ConfigView
+from table.feed import FeedPublisher
 from table.player import PlayerPanel
-from table.resources import icon_file
+from table.resources import icon
 from table.scorer import Scorer
+from table.session import SessionRecorder
+from table.snapshot import loads
+from table.spectator import SpectatorWindow
 
 
 class Window(QMainWindow):
     """The application window."""
 
-    def __init__(self, starting_value, players):
-        """Initialise the window."""
+    def __init__(self, starting_value, players, config=None):
+        """
+        Initialise the window.
+        :param starting_value:  The number of counters each player starts with
+        :param players:  A list of the players
+        :param config:  The dialog used to configure the game, for reuse
+        """
         super().__init__()
         self.setWindowTitle("Pope Joan")
-        self.setWindowIcon(QIcon(icon_file()))
+        self.setWindowIcon(icon())
 
         self.setCentralWidget(
             TableView(starting_value, players)
         )
+        self.config = config
+        self.spectators = []
+        game_menu = self.menuBar().addMenu("&Game")
+        game_menu.addAction("&New Game...", self.new_game)
+        view_menu = self.menuBar().addMenu("&View")
+        view_menu.addAction("&Spectator Window", self.open_spectator)
         self.show()
 
+    def new_game(self):
+        """Configure and start a new game at the same table."""
+        self.config = self.config or ConfigView()
+        if self.config.exec_() == QDialog.Accepted:
+            self.centralWidget().new_game(self.config.starting_value,
+                                          self.config.player_list)
+
+    def open_spectator(self):
+        """Open a read-only view of the board, e.g. for a projector."""
+        window = SpectatorWindow(self.centralWidget())
+        window.destroyed.connect(lambda: self.spectators.remove(window))
+        self.spectators.append(window)
+
 
 class TableView(QGroupBox):
     """Top level view for game activity."""
 
-    def __init__(self, starting_value, players):
-        """Initialise widgets."""
-        self.scorer = Scorer(starting_value, players)
+    # Emitted with the segment winners and cards left in each hand when a
+    # round's results are entered, before they are logged and cleared
+    round_submitted = pyqtSignal(dict, dict)
+    # Emitted once the results of a round have been logged and displayed
+    round_ended = pyqtSignal()
+    # Emitted whenever the displayed state is refreshed
+    refreshed = pyqtSignal()
+    # Emitted with the player's name when a player dresses or goes out
+    dressed = pyqtSignal(str)
+    dropped = pyqtSignal(str)
+    # Emitted with the starting value and players when a new game starts
+    game_started = pyqtSignal(int, list)
+
+    def __init__(self, starting_value, players, scorer=None):
+        """
+        Initialise widgets.
+        :param starting_value:  The number of counters each player starts with
+        :param players:  A list of the players
+        :param scorer:  An existing scorer to resume, in place of a new game
+        """
+        self.scorer = scorer or Scorer(starting_value, players)
+        players = list(self.scorer.balance.players)
         super().__init__(self.scorer.title)
         layout = QGridLayout()
 
@@ -60,15 +109,34 @@ class TableView(QGroupBox):
         # Initial state
         self.refresh_display()
 
+    @classmethod
+    def from_snapshot(cls, buffer):
+        """Create a view resuming the game stored in a scorer snapshot."""
+        scorer = loads(buffer)
+        return cls(None, None, scorer=scorer)
+
+    def new_game(self, starting_value, players):
+        """
+        Start a new game, reusing the existing board and player widgets.
+        :param starting_value:  The number of counters each player starts with
+        :param players:  A list of the players
+        """
+        self.scorer = Scorer(starting_value, list(players))
+        self.q_players.set_players(list(players))
+        self.refresh_display()
+        self.game_started.emit(starting_value, list(players))
+
     def dress(self, player):
         """Dress the board using counters from the given player."""
         self.scorer.log_dress(player.name)
         self.refresh_display()
+        self.dressed.emit(player.name)
 
     def drop(self, player):
         """Drop the given player from the game."""
         self.scorer.drop(player.name)
         self.refresh_display()
+        self.dropped.emit(player.name)
 
     def game_winner_cb(self, name):
         """
@@ -79,13 +147,15 @@ class TableView(QGroupBox):
     def end_round(self):
         """Complete counter transactions required at the end of the round."""
 
+        segment_winners = {name: winner.currentText()
+                           for name, winner in self.q_board.winners.items()}
+        player_cards = {p.name: p.cards_left for p in self.q_players}
+        self.round_submitted.emit(segment_winners, player_cards)
+
         # Log scores and update views
-        self.scorer.log_round(
-            {name: winner.currentText()
-             for name, winner in self.q_board.winners.items()},
-            {p.name: p.cards_left for p in self.q_players}
-        )
+        self.scorer.log_round(segment_winners, player_cards)
         self.refresh_display()
+        self.round_ended.emit()
 
     def refresh_display(self):
         """Refresh all displayed info from the scorer."""
@@ -98,13 +168,36 @@ class TableView(QGroupBox):
                                self.scorer.dresser,
                                self.scorer.balance.players)
         self.q_end_round.setEnabled(False)
+        self.refreshed.emit()
 
 
 if __name__ == '__main__':
-    App = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="A Pope Joan board viewer")
+    parser.add_argument("--capture", metavar="DIR",
+                        help="Save an image of the board after each round")
+    parser.add_argument("--record", metavar="FILE",
+                        help="Record the session's actions for replaying")
+    parser.add_argument("--feed", metavar="NAME",
+                        help="Publish the live game state to shared memory")
+    args, qt_args = parser.parse_known_args()
+
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    App = QApplication(sys.argv[:1] + qt_args)
     App.setStyle("Fusion")
-    App.setWindowIcon(QIcon(icon_file()))
+    App.setWindowIcon(icon())
     config = ConfigView()
     if config.exec_() == QDialog.Accepted:
-        window = Window(config.starting_value, config.player_list)
+        window = Window(config.starting_value, config.player_list, config)
+        if args.capture:
+            capture = BoardCapture(args.capture)
+            capture.attach(window.centralWidget())
+            App.aboutToQuit.connect(capture.close)
+        if args.record:
+            recorder = SessionRecorder(args.record)
+            recorder.attach(window.centralWidget())
+            App.aboutToQuit.connect(recorder.close)
+        if args.feed:
+            feed = FeedPublisher(args.feed)
+            feed.attach(window.centralWidget())
+            App.aboutToQuit.connect(feed.close)
         sys.exit(App.exec())
@@ -47,6 +47,11 @@ class Player(QGroupBox):
 
         self.setLayout(layout)
 
+    def set_name(self, name):
+        """Assign the widget to a player."""
+        self.name = name
+        self.setTitle(name)
+
     def set_color(self, color):
         """Set the color palette."""
         for button in (self.dress, self.drop):
@@ -121,18 +126,38 @@ class PlayerPanel(QWidget):
     def __init__(self, players, dress_cb, drop_cb):
         """Initialise from a list of names and board dressing callback."""
         super().__init__()
-        layout = QGridLayout()
+        self.dress_cb = dress_cb
+        self.drop_cb = drop_cb
+        self.grid = QGridLayout()
+        self.setLayout(self.grid)
 
+        # Every widget created, including those hidden for past players
+        self.pool = []
         self.players = {}
-        for i, name in enumerate(players):
-            player = Player(name, dress_cb, drop_cb)
-            self.players[name] = player
+        self.set_players(players)
+
+    def set_players(self, players):
+        """
+        Show a widget for each of the given players, reusing the existing
+        widgets and only creating more when there are more players.
+        """
+        while len(self.pool) < len(players):
+            i = len(self.pool)
+            player = Player("", self.dress_cb, self.drop_cb)
             row = 2 * (i % self.N_ROWS)
             col = (i // self.N_ROWS)
-            layout.addWidget(player, row, col)
-            layout.setRowStretch(row + 1, 1)
+            self.grid.addWidget(player, row, col)
+            self.grid.setRowStretch(row + 1, 1)
+            self.pool.append(player)
 
-        self.setLayout(layout)
+        self.players = {}
+        for i, player in enumerate(self.pool):
+            if i < len(players):
+                player.set_name(players[i])
+                player.show()
+                self.players[players[i]] = player
+            else:
+                player.hide()
 
     def __getitem__(self, key):
         """Return the requested player widget."""
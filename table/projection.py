@@ -0,0 +1,229 @@
+"""Monte Carlo projection of game length and player bankruptcy."""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from table.scorer import LINKED_SEGMENTS, PLAYER_START_VALUE, SEGMENTS
+
+# Recorded in place of a round for players who never go out
+STILL_IN = -1
+
+# Chance of each segment being won in a round, if not specified
+DEFAULT_WIN_PROBABILITY = {
+    "Game": 1.0,
+    "Ace": 0.5,
+    "Jack": 0.5,
+    "Intrigue": 0.25,
+    "Queen": 0.5,
+    "Matrimony": 0.25,
+    "King": 0.5,
+    "9 Diamonds": 0.5,
+}
+
+
+class PoissonCards:
+    """Cards left in losing hands, drawn from a Poisson distribution."""
+
+    def __init__(self, mean=4):
+        """Initialise with the mean number of cards left."""
+        self.mean = mean
+
+    def __call__(self, rng, size):
+        """Draw an array of card counts."""
+        return rng.poisson(self.mean, size)
+
+
+class UniformCards:
+    """Cards left in losing hands, drawn uniformly from a range."""
+
+    def __init__(self, low=0, high=8):
+        """Initialise with the inclusive range of cards left."""
+        self.low = low
+        self.high = high
+
+    def __call__(self, rng, size):
+        """Draw an array of card counts."""
+        return rng.integers(self.low, self.high + 1, size)
+
+
+def _next_active(dresser, active):
+    """Return the next active player after the dresser in each game."""
+    n_players = active.shape[1]
+    order = (dresser[:, None] + 1 + np.arange(n_players)) % n_players
+    rows = np.arange(len(dresser))[:, None]
+    return order[rows[:, 0], np.argmax(active[rows, order], axis=1)]
+
+
+def _simulate(seed, starting_value, n_players, n_games, stakes,
+              win_probability, cards, max_rounds):
+    """Simulate a batch of games, returning the round each player went out."""
+    rng = np.random.default_rng(seed)
+    segments = list(stakes)
+    values = np.array([stakes[s] for s in segments])
+    dress = values.sum()
+    probability = np.array([win_probability.get(s, 0.0) for s in segments])
+    probability[segments.index("Game")] = 1.0
+    linked = [(segments.index(s), [segments.index(link) for link in links])
+              for s, links in LINKED_SEGMENTS.items() if s in stakes]
+
+    balances = np.full((n_games, n_players), starting_value, dtype=np.int64)
+    pots = np.zeros((n_games, len(segments)), dtype=balances.dtype)
+    active = np.ones((n_games, n_players), dtype=bool)
+    dresser = np.zeros(n_games, dtype=int)
+    rounds_out = np.full((n_games, n_players), STILL_IN, dtype=np.int32)
+
+    # Work on the games still in progress, compacting as they finish
+    games = np.arange(n_games)
+
+    def go_out(rows, players):
+        """Remove players from the game, unless they're the last."""
+        keep = active[rows].sum(axis=1) > 1
+        rows, players = rows[keep], players[keep]
+        active[rows, players] = False
+        rounds_out[games[rows], players] = round_
+
+    for round_ in range(1, max_rounds + 1):
+
+        # Players in debt go out (richest debtor last, so someone remains)
+        in_debt = (balances < 0) & active
+        rows = np.flatnonzero(in_debt.any(axis=1))
+        if len(rows):
+            order = np.argsort(balances[rows], axis=1, kind="stable")
+            for players in order.T:
+                debtor = in_debt[rows, players]
+                go_out(rows[debtor], players[debtor])
+            dresser[rows] = np.where(
+                active[rows, dresser[rows]], dresser[rows],
+                _next_active(dresser[rows], active[rows])
+            )
+
+        # Dressers without enough counters go out, passing on the dressing
+        rows = np.arange(len(games))
+        for _ in range(n_players):
+            broke = (balances[rows, dresser[rows]] < dress) & \
+                (active[rows].sum(axis=1) > 1)
+            rows = rows[broke]
+            if not len(rows):
+                break
+            go_out(rows, dresser[rows])
+            dresser[rows] = _next_active(dresser[rows], active[rows])
+
+        # Stop simulating finished games
+        playing = active.sum(axis=1) > 1
+        if not playing.all():
+            games, balances, pots, active, dresser = (
+                a[playing] for a in (games, balances, pots, active, dresser)
+            )
+        if not len(games):
+            break
+        rows = np.arange(len(games))
+
+        # Dressing phase
+        balances[rows, dresser] -= dress
+        pots += values
+
+        # Scoring phase
+        won = rng.random((len(games), len(segments))) < probability
+        seats = np.argsort(~active, axis=1, kind="stable")
+        picks = (rng.random((len(games), len(segments)))
+                 * active.sum(axis=1)[:, None]).astype(int)
+        winners = seats[rows[:, None], picks]
+        for segment, links in linked:
+            for link in links:
+                winners[:, link] = np.where(won[:, segment],
+                                            winners[:, segment],
+                                            winners[:, link])
+                won[:, link] |= won[:, segment]
+        for segment in range(len(segments)):
+            rows_won = rows[won[:, segment]]
+            balances[rows_won, winners[rows_won, segment]] += \
+                pots[rows_won, segment]
+            pots[rows_won, segment] = 0
+
+        game_winner = winners[:, segments.index("Game")]
+        left = cards(rng, (len(games), n_players)) * active
+        left[rows, game_winner] = 0
+        balances -= left
+        balances[rows, game_winner] += left.sum(axis=1)
+
+        dresser = _next_active(dresser, active)
+
+    return rounds_out
+
+
+def project(starting_value=PLAYER_START_VALUE, n_players=4, n_games=10000,
+            stakes=SEGMENTS, win_probability=None, cards=None,
+            max_rounds=1000, seed=None, workers=None, chunk_size=50000):
+    """
+    Simulate many games, returning the round in which each player went out.
+
+    Games follow the scorer rules: the dresser pays each segment its stake,
+    segment winners collect the segment's counters (with linked segments
+    won together) and the game winner collects a counter per card left in
+    each other hand.  Players go out when in debt, or when they can't
+    afford to dress.
+    :param starting_value:  The number of counters each player starts with
+    :param n_players:  The number of players
+    :param n_games:  The number of games to simulate
+    :param stakes:  The counters paid into each segment when dressing
+    :param win_probability:  The chance of each segment being won per round
+    :param cards:  Callable drawing cards left, given a generator and shape
+    :param max_rounds:  The round after which games are abandoned
+    :param seed:  Seed for reproducible projections
+    :param workers:  The number of processes to simulate with
+    :param chunk_size:  The number of games simulated at once per process
+    :return:  An (n_games, n_players) array of rounds, with STILL_IN for
+              players still in the game at the end
+    """
+    win_probability = win_probability or DEFAULT_WIN_PROBABILITY
+    cards = cards or PoissonCards()
+    sizes = [min(chunk_size, n_games - start)
+             for start in range(0, n_games, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [(s, starting_value, n_players, size, stakes, win_probability,
+             cards, max_rounds) for s, size in zip(seeds, sizes)]
+    if workers == 1 or len(args) == 1:
+        results = [_simulate(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simulate, *zip(*args)))
+    return np.concatenate(results) if results else \
+        np.empty((0, n_players), dtype=np.int32)
+
+
+def game_lengths(rounds_out):
+    """Return the number of rounds until each projected game was won."""
+    finished = (rounds_out != STILL_IN).sum(axis=1) == \
+        rounds_out.shape[1] - 1
+    return np.where(finished, rounds_out.max(axis=1), STILL_IN)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("starting_value", type=int)
+    parser.add_argument("n_players", type=int)
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--cards", type=float, default=4,
+                        help="Mean number of cards left in losing hands")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    rounds_out = project(args.starting_value, args.n_players, args.games,
+                         cards=PoissonCards(args.cards), seed=args.seed,
+                         workers=args.workers)
+    quantiles = (5, 25, 50, 75, 95)
+    print("Rounds until out:  " + "  ".join(f"p{q:<4}" for q in quantiles))
+    for player in range(args.n_players):
+        out = rounds_out[:, player]
+        out = out[out != STILL_IN]
+        values = np.percentile(out, quantiles) if len(out) else \
+            [np.nan] * len(quantiles)
+        print(f"Player {player + 1:<10}" +
+              "  ".join(f"{v:<5.0f}" for v in values))
+    lengths = game_lengths(rounds_out)
+    lengths = lengths[lengths != STILL_IN]
+    if len(lengths):
+        print(f"Game length: median {np.median(lengths):.0f} rounds, "
+              f"{len(lengths) / len(rounds_out):.1%} of games finished")
@@ -0,0 +1,285 @@
+"""Offline recognition of cards in photographs of the table."""
+import argparse
+import glob
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPainterPath
+from PyQt5.QtWidgets import QApplication
+
+from table.engine import (
+    DECK,
+    RANK,
+    RANKS,
+    SUIT,
+    SUITS,
+    card_name,
+    parse_card,
+    round_result,
+)
+
+# Height and width of a card's index in a photo, in pixels
+TEMPLATE_SIZE = (48, 32)
+
+# Normalised correlation above which a card is considered found
+THRESHOLD = 0.8
+
+# Side of the tiles photos are correlated in, and the memory in bytes for
+# correlating a tile with a batch of templates
+TILE_SIZE = 512
+BATCH_MEMORY = 1 << 26
+
+RED_SUITS = {SUITS.index("D"), SUITS.index("H")}
+
+
+def to_array(image):
+    """Return a greyscale image as an array of 32-bit floats from 0 to 1."""
+    image = image.convertToFormat(QImage.Format_Grayscale8)
+    bits = image.constBits()
+    bits.setsize(image.bytesPerLine() * image.height())
+    array = np.frombuffer(bits, np.uint8).reshape(
+        image.height(), image.bytesPerLine()
+    )[:, :image.width()]
+    return np.divide(array, 255, dtype=np.float32)
+
+
+def _suit_path(suit, rect):
+    """Return the outline of a suit symbol filling the given rectangle."""
+    path = QPainterPath()
+    x, y, w, h = rect.x(), rect.y(), rect.width(), rect.height()
+    if SUITS[suit] == "D":
+        path.moveTo(x + w / 2, y)
+        path.lineTo(x + w, y + h / 2)
+        path.lineTo(x + w / 2, y + h)
+        path.lineTo(x, y + h / 2)
+        path.closeSubpath()
+    elif SUITS[suit] == "C":
+        r = w / 4
+        for cx, cy in ((w / 2, r), (r, h / 2), (w - r, h / 2)):
+            path.addEllipse(QPointF(x + cx, y + cy), r, r)
+        path.addRect(x + w / 2 - w / 12, y + h / 2, w / 6, h / 2)
+    else:
+        # Hearts, and spades as upside down hearts with a stem
+        top, bottom = (y, y + h) if SUITS[suit] == "H" else (y + h, y)
+        r = w / 4
+        sign = 1 if SUITS[suit] == "H" else -1
+        path.addEllipse(QPointF(x + r, top + sign * r), r, r)
+        path.addEllipse(QPointF(x + w - r, top + sign * r), r, r)
+        triangle = QPainterPath()
+        triangle.moveTo(x, top + sign * r * 1.3)
+        triangle.lineTo(x + w, top + sign * r * 1.3)
+        triangle.lineTo(x + w / 2, bottom)
+        triangle.closeSubpath()
+        path.addPath(triangle)
+        if SUITS[suit] == "S":
+            path.addRect(x + w / 2 - w / 12, y + h / 2, w / 6, h / 2)
+    path.setFillRule(Qt.WindingFill)
+    return path
+
+
+def render_template(c):
+    """Draw the index of a card: its rank above its suit."""
+    h, w = TEMPLATE_SIZE
+    image = QImage(w, h, QImage.Format_RGB32)
+    image.fill(Qt.white)
+    colour = QColor(200, 0, 0) if SUIT[c] in RED_SUITS else QColor(Qt.black)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(colour)
+    font = QFont("DejaVu Sans")
+    font.setPixelSize(h // 2 - 4)
+    font.setBold(True)
+    painter.setFont(font)
+    painter.drawText(QRectF(0, 0, w, h / 2), Qt.AlignCenter,
+                     RANKS[RANK[c]])
+    painter.fillPath(_suit_path(SUIT[c], QRectF(w / 4, h / 2 + 2,
+                                                w / 2, h / 2 - 4)),
+                     colour)
+    painter.end()
+    return to_array(image)
+
+
+def load_templates(directory=None):
+    """
+    Return the cards and an array of their templates, either read from a
+    directory of images named by card (e.g. '9D.png') or drawn.
+    """
+    if directory is None:
+        cards = list(DECK)
+        templates = [render_template(c) for c in cards]
+    else:
+        paths = sorted(glob.glob(os.path.join(directory, "*.png")))
+        cards = [parse_card(os.path.splitext(os.path.basename(p))[0])
+                 for p in paths]
+        templates = [to_array(QImage(p)) for p in paths]
+    return cards, np.stack(templates)
+
+
+def _window_sums(image, h, w):
+    """Return the sum of the image over every h by w window."""
+    integral = np.pad(image.cumsum(axis=0, dtype=np.float64)
+                      .cumsum(axis=1), ((1, 0), (1, 0)))
+    return (integral[h:, w:] - integral[:-h, w:]
+            - integral[h:, :-w] + integral[:-h, :-w])
+
+
+def _local_deviation(image, h, w):
+    """
+    Return the root of the sum of squared deviations from the mean over
+    every h by w window.
+    """
+    sums = _window_sums(image, h, w)
+    squares = _window_sums(image ** 2, h, w)
+    return np.sqrt(np.maximum(squares - sums ** 2 / (h * w), 1e-6)) \
+        .astype(np.float32)
+
+
+def match(image, cards, templates, threshold=THRESHOLD, tile=TILE_SIZE,
+          memory=BATCH_MEMORY):
+    """
+    Find cards in an image by normalised cross-correlation with each
+    template, computed by FFT for all positions in a tile at once.
+
+    The image is correlated in overlapping tiles, with as many templates at a
+    time as fit in the memory given, so memory is bounded however large the
+    photo.
+    :param tile:  The side of the tiles, in pixels
+    :param memory:  The memory in bytes for correlating a batch of templates
+    :return:  A list of (card, score, (row, column)) for each card found
+    """
+    n, h, w = templates.shape
+    rows, cols = image.shape[0] - h + 1, image.shape[1] - w + 1
+    if rows < 1 or cols < 1:
+        return []
+    image = image.astype(np.float32, copy=False)
+    shape = (min(max(tile, 2 * h), image.shape[0]),
+             min(max(tile, 2 * w), image.shape[1]))
+    step = (shape[0] - h + 1, shape[1] - w + 1)
+    # Each template's spectrum, its product with the tile's, and the scores
+    batch = max(1, memory // (16 * shape[0] * shape[1]))
+
+    # Normalise the templates, and the image in each window
+    zero_mean = templates - templates.mean(axis=(1, 2), keepdims=True)
+    norms = np.linalg.norm(zero_mean, axis=(1, 2), keepdims=True)
+    zero_mean = (zero_mean / np.where(norms > 0, norms, 1)) \
+        .astype(np.float32)
+
+    # Keep the best matching template at each position
+    best = np.full((rows, cols), -1, np.float32)
+    which = np.zeros((rows, cols), dtype=np.int16)
+    block = np.zeros(shape, np.float32)
+    for start in range(0, n, batch):
+        kernels = np.conj(np.fft.rfft2(zero_mean[start:start + batch],
+                                       s=shape))
+        for row in range(0, rows, step[0]):
+            for col in range(0, cols, step[1]):
+                part = image[row:row + shape[0], col:col + shape[1]]
+                block[:] = 0
+                block[:part.shape[0], :part.shape[1]] = part
+                local = _local_deviation(part, h, w)
+                r, c = local.shape
+                scores = np.fft.irfft2(np.fft.rfft2(block) * kernels,
+                                       s=shape)[:, :r, :c]
+                scores /= local
+                top = scores.argmax(axis=0)
+                score = np.take_along_axis(scores, top[None], axis=0)[0]
+                region = (slice(row, row + r), slice(col, col + c))
+                better = score > best[region]
+                best[region][better] = score[better]
+                which[region][better] = top[better] + start
+
+    # Take the best matches, suppressing overlapping ones
+    found = []
+    while True:
+        row, col = np.unravel_index(best.argmax(), best.shape)
+        score = best[row, col]
+        if score < threshold:
+            return found
+        found.append((cards[which[row, col]], float(score), (row, col)))
+        best[max(0, row - h + 1):row + h, max(0, col - w + 1):col + w] = -1
+
+
+def recognise_file(path, cards, templates, scale=1, threshold=THRESHOLD):
+    """Return the cards found in an image file, from left to right."""
+    image = QImage(path)
+    if image.isNull():
+        raise ValueError(f"Could not read image {path}")
+    if scale != 1:
+        image = image.scaled(round(scale * image.width()),
+                             round(scale * image.height()),
+                             Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    found = match(to_array(image), cards, templates, threshold)
+    return [c for c, _, _ in sorted(found, key=lambda f: f[2][1])]
+
+
+def recognise_files(paths, templates=None, workers=None, **kwargs):
+    """
+    Recognise the cards in a batch of image files, spread over a pool of
+    processes.
+    :param paths:  The image files
+    :param templates:  The cards and templates from load_templates
+    :param workers:  The number of processes to use
+    :return:  A dict of the cards found in each file
+    """
+    cards, templates = templates or load_templates()
+    recognise = partial(recognise_file, cards=cards, templates=templates,
+                        **kwargs)
+    if workers == 1 or len(paths) < 2:
+        return OrderedDict(zip(paths, map(recognise, paths)))
+    with ProcessPoolExecutor(workers) as executor:
+        return OrderedDict(zip(paths, executor.map(recognise, paths)))
+
+
+def read_round(directory, players, dealer, templates=None, workers=None,
+               **kwargs):
+    """
+    Recognise the photos of a round, returning the segment winners and cards
+    left in each player's hand, as required by the scorer, by the same rules
+    as a hand played out by the engine.
+
+    The directory holds 'trump.png', showing the card turned up, and for
+    each player '<player>.hand.png', showing the cards left in their hand,
+    and optionally '<player>.played.png', showing the trump honours and Pope
+    they played.  A missing hand photo means the player has no cards left.
+    """
+    def path(name):
+        return os.path.join(directory, name)
+
+    paths = [path("trump.png")] + [
+        path(f"{player}.{kind}.png") for player in players
+        for kind in ("hand", "played")
+        if os.path.exists(path(f"{player}.{kind}.png"))
+    ]
+    found = recognise_files(paths, templates, workers, **kwargs)
+    if len(found[path("trump.png")]) != 1:
+        raise ValueError("Expected a single card turned up for trumps")
+    return round_result(
+        players,
+        {p: found.get(path(f"{p}.hand.png"), []) for p in players},
+        {p: found.get(path(f"{p}.played.png"), []) for p in players},
+        found[path("trump.png")][0],
+        dealer,
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Recognise the cards in photos of the table"
+    )
+    parser.add_argument("images", nargs="+")
+    parser.add_argument("--templates", help="Directory of card templates")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    App = QApplication(sys.argv[:1])
+    results = recognise_files(args.images, load_templates(args.templates),
+                              args.workers, scale=args.scale)
+    for path, cards in results.items():
+        print(f"{path}: {' '.join(card_name(c) for c in cards)}")
@@ -0,0 +1,109 @@
+"""Replaying recorded sessions as load tests of the table."""
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from table.main import TableView
+from table.session import read_session
+from table.snapshot import dumps
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Latency percentiles reported, per action
+PERCENTILES = (50, 90, 99, 100)
+
+Report = namedtuple("Report", ["latencies", "peak_memory", "snapshot"])
+
+
+def _apply(table, action):
+    """Take a recorded action at the table."""
+    kind = action["action"]
+    if kind == "dress":
+        table.dress(table.q_players[action["player"]])
+    elif kind == "drop":
+        table.drop(table.q_players[action["player"]])
+    elif kind == "winner":
+        winner = table.q_board.winners[action["segment"]]
+        winner.setCurrentIndex(winner.findText(action["player"]))
+    elif kind == "cards":
+        table.q_players[action["player"]].cards.setText(action["text"])
+    elif kind == "end_round":
+        table.end_round()
+    elif kind == "new_game":
+        table.new_game(action["starting_value"], action["players"])
+    else:
+        raise ValueError(f"Unknown action {kind}")
+
+
+def _peak_memory():
+    """Return the peak resident memory of the process in bytes, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux, and bytes on macOS
+    return peak if sys.platform == "darwin" else 1024 * peak
+
+
+def replay(path, show=True):
+    """
+    Replay a recorded session as fast as possible, timing each action
+    including the processing of the events it causes.
+    :return:  A report of the latencies in seconds of each kind of action,
+              the peak memory use and a snapshot of the final game state
+    """
+    snapshot, actions = read_session(path)
+    app = QApplication.instance()
+    table = TableView.from_snapshot(snapshot)
+    if show:
+        table.show()
+    app.processEvents()
+
+    latencies = {}
+    for action in actions:
+        start = time.perf_counter()
+        _apply(table, action)
+        app.processEvents()
+        latencies.setdefault(action["action"], []).append(
+            time.perf_counter() - start
+        )
+    table.close()
+    return Report(
+        {kind: np.array(times) for kind, times in latencies.items()},
+        _peak_memory(),
+        dumps(table.scorer),
+    )
+
+
+def summarise(report):
+    """Return a table of latency percentiles by action, in milliseconds."""
+    lines = ["Action       Count  " + "".join(f"p{p:<7}" for p in PERCENTILES)]
+    everything = np.concatenate(list(report.latencies.values()) or [[]])
+    for kind, times in [*sorted(report.latencies.items()),
+                        ("all", everything)]:
+        if len(times):
+            values = np.percentile(1000 * times, PERCENTILES)
+            lines.append(f"{kind:<12} {len(times):>5}  "
+                         + "".join(f"{v:<8.2f}" for v in values))
+    if report.peak_memory is not None:
+        lines.append(f"Peak memory: {report.peak_memory / 2 ** 20:.1f} MiB")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded session, reporting action latencies"
+    )
+    parser.add_argument("session")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    App = QApplication(sys.argv[:1])
+    print(summarise(replay(args.session)))
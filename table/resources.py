@@ -1,7 +1,13 @@
+"""Access to the image resources, loaded once per process."""
 import os
 import sys
+from functools import lru_cache
 
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QIcon, QImage
 
+
+@lru_cache(maxsize=None)
 def resource_dir():
     """Return the path to the resources directory."""
     root_dir = (getattr(sys, "_MEIPASS", os.path.abspath("."))
@@ -17,3 +23,29 @@ def background_image_file():
 def icon_file():
     """Return the path to the icon file."""
     return os.path.join(resource_dir(), "icon.ico")
+
+
+def background_image(scale=1):
+    """
+    Return the decoded background image, shared by all users.
+    :param scale:  Factor by which to pre-scale the image, to two decimal
+                   places
+    """
+    return _background_image(round(float(scale), 2))
+
+
+@lru_cache(maxsize=8)
+def _background_image(scale):
+    """Return the background image at a scale already rounded."""
+    if scale == 1:
+        return QImage(background_image_file())
+    image = _background_image(1.0)
+    return image.scaled(round(scale * image.width()),
+                        round(scale * image.height()),
+                        Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+
+
+@lru_cache(maxsize=None)
+def icon():
+    """Return the application icon, shared by all windows."""
+    return QIcon(icon_file())
@@ -1,8 +1,17 @@
+import threading
 from collections import OrderedDict, namedtuple
 from enum import Enum, auto
+from types import MappingProxyType
+
+from table.ledger import Ledger, player as player_account, segment
 
 Balance = namedtuple("Balance", ["segments", "players"])
 
+# The state of play at a point in time, numbered by version
+State = namedtuple(
+    "State", ["version", "round", "phase", "players", "dresser", "balance"]
+)
+
 SEGMENTS = OrderedDict([
     ("Game", 1),
     ("Ace", 1),
@@ -14,6 +23,12 @@ SEGMENTS = OrderedDict([
     ("9 Diamonds", 6),
 ])
 
+# Segments won automatically along with another segment
+LINKED_SEGMENTS = OrderedDict([
+    ("Intrigue", ("Jack", "Queen")),
+    ("Matrimony", ("Queen", "King")),
+])
+
 PLAYER_START_VALUE = 50
 
 
@@ -35,59 +50,185 @@ class Phase(Enum):
             return self.DRESSING
 
 
+def _freeze(segments, players):
+    """Return read-only balances, sharing no data with those given."""
+    return Balance(
+        segments=MappingProxyType(dict(segments)),
+        players=MappingProxyType(dict(players)),
+    )
+
+
 class Scorer:
-    """A tracker of the state of play."""
+    """
+    A tracker of the state of play.
+
+    Each change publishes a new, immutable state, so readers on any thread
+    get a consistent view of the game from snapshot without locking.  The
+    attributes each read whatever state is current, so reading several of
+    them may span a change; only snapshot gives a consistent view.  Changes
+    are serialised on a lock, so each is based on the last.  Every transfer
+    of counters is also recorded in the scorer's ledger.
+    """
 
     def __init__(self, starting_value, players):
         """Initialise round and phase."""
-        self.round = 1
-        self.phase = Phase.DRESSING
-        self.players = players
-        self.dresser = players[0]
-        self.balance = Balance(
-            segments={s: 0 for s in SEGMENTS},
-            players={p: starting_value for p in self.players},
-        )
+        self._start(State(
+            version=0,
+            round=1,
+            phase=Phase.DRESSING,
+            players=tuple(players),
+            dresser=players[0],
+            balance=_freeze(
+                segments={s: 0 for s in SEGMENTS},
+                players={p: starting_value for p in players},
+            ),
+        ))
+
+    def _start(self, state):
+        """Start tracking from the given state."""
+        self._lock = threading.Lock()
+        self._state = state
+        # The ledger opens with these balances, once it is first needed
+        self._opening = state.balance
+        self._ledger = None
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Return a scorer continuing from the given state.  The earlier
+        transfers aren't known, so the scorer's ledger starts from the
+        restored balances, entered at round 0.
+        """
+        scorer = cls.__new__(cls)
+        scorer._start(state._replace(
+            players=tuple(state.players),
+            balance=_freeze(*state.balance),
+        ))
+        return scorer
+
+    def _get_ledger(self):
+        """Return the ledger, creating it if needed, with the lock held."""
+        if self._ledger is None:
+            self._ledger = Ledger(self._opening.players,
+                                  self._opening.segments)
+        return self._ledger
+
+    @property
+    def ledger(self):
+        """The ledger of every transfer of counters."""
+        with self._lock:
+            return self._get_ledger()
+
+    def snapshot(self):
+        """Return the current state."""
+        return self._state
 
-    def _advance_dresser(self):
-        """Move on to the next dresser."""
-        self.dresser = self.players[
-            (self.players.index(self.dresser) + 1) % len(self.players)
-        ]
+    @property
+    def version(self):
+        """The number of changes made to the state."""
+        return self._state.version
+
+    @property
+    def round(self):
+        """The current round."""
+        return self._state.round
+
+    @property
+    def phase(self):
+        """The phase of the current round."""
+        return self._state.phase
+
+    @property
+    def players(self):
+        """The players still in the game, in seating order."""
+        return self._state.players
+
+    @property
+    def dresser(self):
+        """The player to dress the board this round."""
+        return self._state.dresser
+
+    @property
+    def balance(self):
+        """The counters in each segment and held by each player."""
+        return self._state.balance
+
+    def _publish(self, state, **changes):
+        """Replace the given state with a new version."""
+        self._state = state._replace(version=state.version + 1, **changes)
+
+    @staticmethod
+    def _next_dresser(state, players):
+        """Return the next dresser still in the game."""
+        seats = list(state.balance.players)
+        seat = seats.index(state.dresser)
+        return next(
+            seats[(seat + offset) % len(seats)]
+            for offset in range(1, len(seats) + 1)
+            if seats[(seat + offset) % len(seats)] in players
+        )
 
-    def _advance(self):
-        """Proceed to the next round/phase."""
-        self.phase = self.phase.next()
-        if self.phase == Phase.DRESSING:
-            self.round += 1
-            self._advance_dresser()
+    def _advance(self, state, segments, players):
+        """Publish new balances, proceeding to the next round/phase."""
+        changes = dict(phase=state.phase.next(),
+                       balance=_freeze(segments, players))
+        if changes["phase"] == Phase.DRESSING:
+            changes.update(round=state.round + 1,
+                           dresser=self._next_dresser(state, state.players))
+        self._publish(state, **changes)
 
     def log_dress(self, player):
         """Log a player dressing the board."""
-        self.balance.players[player] -= dress_value()
-        for segment, value in SEGMENTS.items():
-            self.balance.segments[segment] += value
-        self._advance()
+        with self._lock:
+            state, ledger = self._state, self._get_ledger()
+            segments, players = map(dict, state.balance)
+            players[player] -= dress_value()
+            for name, value in SEGMENTS.items():
+                segments[name] += value
+                ledger.record(state.round, player_account(player),
+                              segment(name), value)
+            self._advance(state, segments, players)
 
     def log_round(self, segment_winners, player_cards):
         """Log the results of the round."""
-        for segment, winner in segment_winners.items():
-            if winner:
-                self.balance.players[winner] += self.balance.segments[segment]
-                self.balance.segments[segment] = 0
-        for player, cards in player_cards.items():
-            self.balance.players[player] -= cards
-            self.balance.players[segment_winners["Game"]] += cards
-        self._advance()
+        with self._lock:
+            state, ledger = self._state, self._get_ledger()
+            segments, players = map(dict, state.balance)
+            for name, winner in segment_winners.items():
+                if winner:
+                    if segments[name]:
+                        ledger.record(state.round, segment(name),
+                                      player_account(winner), segments[name])
+                    players[winner] += segments[name]
+                    segments[name] = 0
+            game_winner = segment_winners["Game"]
+            for player, cards in player_cards.items():
+                players[player] -= cards
+                players[game_winner] += cards
+                if cards and player != game_winner:
+                    ledger.record(state.round, player_account(player),
+                                  player_account(game_winner), cards)
+            self._advance(state, segments, players)
 
     @property
     def title(self):
         """Return a title for displaying round and phase."""
-        return f"Round {self.round} - {self.phase.name.title()}"
+        state = self._state
+        return f"Round {state.round} - {state.phase.name.title()}"
 
     def drop(self, player):
         """Remove the given player from the game."""
-        if len(self.players) > 1:
-            if player == self.dresser:
-                self._advance_dresser()
-            self.players.remove(player)
+        with self._lock:
+            state = self._state
+            if player not in state.players:
+                raise ValueError(f"{player} is not in the game")
+            if len(state.players) > 1:
+                players = tuple(p for p in state.players if p != player)
+                changes = dict(players=players)
+                # A dresser going out while scoring still finishes the round
+                if player == state.dresser and \
+                        state.phase == Phase.DRESSING:
+                    changes.update(
+                        dresser=self._next_dresser(state, players)
+                    )
+                self._publish(state, **changes)
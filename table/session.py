@@ -0,0 +1,88 @@
+"""Recording of the actions taken at the table."""
+import base64
+import json
+import time
+
+from table.snapshot import dumps
+
+VERSION = 1
+
+
+class SessionRecorder:
+    """
+    Records the actions a user takes at a table, with timestamps, to a
+    session file of one JSON object per line.
+
+    The first line holds a snapshot of the game when recording started, and
+    each following line an action: 'dress', 'drop', 'winner', 'cards',
+    'end_round' or 'new_game'.
+    """
+
+    def __init__(self, path):
+        """Open the session file."""
+        self.file = open(path, "w")
+        self.start = None
+        self.connected = set()
+
+    def attach(self, table):
+        """Record the actions taken at a table view from now on."""
+        self.start = time.perf_counter()
+        self._write(version=VERSION,
+                    snapshot=base64.b64encode(dumps(table.scorer)).decode())
+
+        table.dressed.connect(lambda name: self.record("dress", player=name))
+        table.dropped.connect(lambda name: self.record("drop", player=name))
+        table.round_ended.connect(lambda: self.record("end_round"))
+        table.game_started.connect(
+            lambda value, players: self._game_started(table, value, players)
+        )
+        for segment, winner in table.q_board.winners.items():
+            winner.activated.connect(
+                lambda _, s=segment, w=winner: self.record(
+                    "winner", segment=s, player=w.currentText()
+                )
+            )
+        self._connect_players(table)
+
+    def _game_started(self, table, starting_value, players):
+        """Record a new game, and any player widgets added for it."""
+        self.record("new_game", starting_value=starting_value,
+                    players=players)
+        self._connect_players(table)
+
+    def _connect_players(self, table):
+        """Record card entries for player widgets not yet connected."""
+        for player in table.q_players.pool:
+            if id(player) not in self.connected:
+                self.connected.add(id(player))
+                player.cards.textEdited.connect(
+                    lambda text, p=player: self.record(
+                        "cards", player=p.name, text=text
+                    )
+                )
+
+    def record(self, action, **details):
+        """Record an action, timed from the start of recording."""
+        self._write(t=round(time.perf_counter() - self.start, 6),
+                    action=action, **details)
+
+    def _write(self, **entry):
+        """Write a line to the session file."""
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+
+    def close(self):
+        """Close the session file."""
+        self.file.close()
+
+
+def read_session(path):
+    """Return the starting snapshot and list of actions in a session file."""
+    with open(path) as f:
+        header = json.loads(f.readline())
+        if header.get("version") != VERSION:
+            raise ValueError(
+                f"Unsupported session version {header.get('version')}"
+            )
+        actions = [json.loads(line) for line in f if line.strip()]
+    return base64.b64decode(header["snapshot"]), actions
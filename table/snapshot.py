@@ -0,0 +1,101 @@
+"""Compact binary snapshots of the scorer state."""
+import struct
+
+from table.scorer import Balance, Phase, SEGMENTS, Scorer, State
+
+MAGIC = b"PJSN"
+VERSION = 1
+
+# magic, version, round, phase, number of names, number of active players,
+# dresser (index into names), number of segments
+_HEADER = struct.Struct("<4sBIBBBBB")
+_NAME_LENGTH = struct.Struct("<H")
+
+_PHASES = {phase.value: phase for phase in Phase}
+
+
+class SnapshotError(ValueError):
+    """Raised when a buffer does not hold a readable snapshot."""
+
+
+def dumps(scorer):
+    """Encode the state of a scorer as bytes."""
+    state = scorer.snapshot()
+    names = list(state.balance.players)
+    seats = [names.index(p) for p in state.players]
+    encoded_names = [name.encode("utf-8") for name in names]
+    n_segments = len(state.balance.segments)
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, state.round, state.phase.value,
+                     len(names), len(seats), names.index(state.dresser),
+                     n_segments),
+        struct.pack(f"<{n_segments}i", *state.balance.segments.values()),
+        struct.pack(f"<{len(names)}i", *state.balance.players.values()),
+        bytes(seats),
+    ]
+    for name in encoded_names:
+        parts.append(_NAME_LENGTH.pack(len(name)))
+        parts.append(name)
+    return b"".join(parts)
+
+
+def loads(buffer, offset=0):
+    """
+    Decode a scorer from a snapshot.
+
+    Fields are unpacked directly from the buffer, so any object supporting
+    the buffer protocol (bytes, a memoryview or an mmap) can be read without
+    first being copied.
+    :param buffer:  The buffer containing the snapshot
+    :param offset:  The position of the snapshot within the buffer
+    """
+    try:
+        (magic, version, round_, phase, n_names, n_seats, dresser,
+         n_segments) = _HEADER.unpack_from(buffer, offset)
+    except struct.error as error:
+        raise SnapshotError(str(error))
+    if magic != MAGIC:
+        raise SnapshotError("Buffer does not contain a snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    if phase not in _PHASES:
+        raise SnapshotError(f"Unknown phase {phase}")
+    if n_segments != len(SEGMENTS):
+        raise SnapshotError(f"Expected {len(SEGMENTS)} segments, "
+                            f"found {n_segments}")
+
+    try:
+        offset += _HEADER.size
+        segments = struct.unpack_from(f"<{n_segments}i", buffer, offset)
+        offset += 4 * n_segments
+        players = struct.unpack_from(f"<{n_names}i", buffer, offset)
+        offset += 4 * n_names
+        seats = struct.unpack_from(f"<{n_seats}B", buffer, offset)
+        offset += n_seats
+        view = memoryview(buffer)
+        names = []
+        for _ in range(n_names):
+            length, = _NAME_LENGTH.unpack_from(buffer, offset)
+            offset += _NAME_LENGTH.size
+            if offset + length > view.nbytes:
+                raise SnapshotError("Snapshot is truncated")
+            names.append(str(view[offset:offset + length], "utf-8"))
+            offset += length
+    except (struct.error, UnicodeDecodeError) as error:
+        raise SnapshotError(str(error))
+    if max(seats, default=-1) >= n_names or dresser >= n_names:
+        raise SnapshotError("Seat or dresser is not a player")
+    if len(set(names)) != n_names:
+        raise SnapshotError("Players' names are repeated")
+
+    return Scorer.from_state(State(
+        version=0,
+        round=round_,
+        phase=_PHASES[phase],
+        players=[names[i] for i in seats],
+        dresser=names[dresser],
+        balance=Balance(
+            segments=dict(zip(SEGMENTS, segments)),
+            players=dict(zip(names, players)),
+        ),
+    ))
@@ -0,0 +1,95 @@
+"""Read-only views of the board, e.g. for a projector."""
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPainter
+from PyQt5.QtWidgets import QApplication, QGraphicsView, QMainWindow
+
+from table.resources import icon
+
+
+class SpectatorView(QGraphicsView):
+    """
+    A display-only view of a board's scene.
+
+    The view shares the board's scene items, so it always shows the same
+    state without duplicating them, but passes no input to the widgets.
+    """
+
+    ZOOM_STEP = 1.1
+
+    def __init__(self, board):
+        """Initialise a view onto the board's scene."""
+        super().__init__(board.scene())
+        self.setInteractive(False)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.zoom = 1.0
+        board.scene().sceneRectChanged.connect(self.fit)
+
+    def set_zoom(self, zoom):
+        """Set the zoom relative to fitting the whole board in view."""
+        self.zoom = zoom
+        self.fit()
+
+    def fit(self):
+        """Scale the board to fit the view."""
+        self.fitInView(self.scene().sceneRect(), Qt.KeepAspectRatio)
+        self.scale(self.zoom, self.zoom)
+
+    def resizeEvent(self, event):
+        """Refit the board to the resized view."""
+        super().resizeEvent(event)
+        self.fit()
+
+
+class SpectatorWindow(QMainWindow):
+    """A window showing a table's board to spectators."""
+
+    def __init__(self, table):
+        """Initialise the window, on a second screen if there is one."""
+        super().__init__()
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowIcon(icon())
+        self.view = SpectatorView(table.q_board)
+        self.setCentralWidget(self.view)
+
+        self.table = table
+        table.refreshed.connect(self.refresh)
+        self.refresh()
+
+        screens = QApplication.screens()
+        if len(screens) > 1:
+            self.setGeometry(screens[1].geometry())
+            self.showFullScreen()
+        else:
+            self.show()
+
+    def closeEvent(self, event):
+        """Stop following the table once closed."""
+        try:
+            self.table.refreshed.disconnect(self.refresh)
+            self.view.scene().sceneRectChanged.disconnect(self.view.fit)
+        except TypeError:
+            # Already disconnected by an earlier close
+            pass
+        super().closeEvent(event)
+
+    def refresh(self):
+        """Show the round and phase in the window title."""
+        self.setWindowTitle(f"Pope Joan - {self.table.title()}")
+
+    def keyPressEvent(self, event):
+        """Zoom with +/- and toggle full screen with F."""
+        if event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.view.set_zoom(self.view.zoom * SpectatorView.ZOOM_STEP)
+        elif event.key() == Qt.Key_Minus:
+            self.view.set_zoom(self.view.zoom / SpectatorView.ZOOM_STEP)
+        elif event.key() == Qt.Key_F:
+            if self.isFullScreen():
+                self.showNormal()
+            else:
+                self.showFullScreen()
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,229 @@
+"""Sweeps of game length projections over variants of the house rules."""
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from table.config import PlayerList
+from table.projection import (
+    DEFAULT_WIN_PROBABILITY,
+    STILL_IN,
+    PoissonCards,
+    game_lengths,
+    project,
+)
+from table.scorer import LINKED_SEGMENTS, SEGMENTS
+
+# Bump whenever the simulation changes, so that cached results are not reused
+CACHE_VERSION = 1
+
+# Default size of the result cache, in bytes
+CACHE_SIZE = 1 << 30
+
+# A configuration of the rules: the stakes, as (segment, stake) pairs, the
+# starting value and the number of players
+Point = namedtuple("Point", ["stakes", "starting_value", "n_players"])
+
+
+def grid(stakes=(SEGMENTS,), starting_values=(50,),
+         player_counts=range(1, PlayerList.MAX_PLAYERS + 1)):
+    """Return the points for every combination of the rules given."""
+    return [Point(tuple(s.items()), value, n)
+            for s, value, n in itertools.product(stakes, starting_values,
+                                                 player_counts)]
+
+
+def point_key(point, n_games, seed, win_probability, cards, max_rounds):
+    """
+    Return a hash of everything determining the projection for a point,
+    identifying its results in the cache.
+    """
+    description = {
+        "version": CACHE_VERSION,
+        "linked": LINKED_SEGMENTS,
+        "stakes": point.stakes,
+        "starting_value": point.starting_value,
+        "n_players": point.n_players,
+        "n_games": n_games,
+        "seed": seed,
+        "win_probability": sorted(win_probability.items()),
+        "cards": [type(cards).__name__, sorted(vars(cards).items())],
+        "max_rounds": max_rounds,
+    }
+    encoded = json.dumps(description, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """
+    An on-disk cache of projections, with files named by their key.
+
+    Reading a result marks it as recently used, and the least recently used
+    results are evicted once the cache grows beyond its maximum size.
+    """
+
+    EXTENSION = ".npy"
+
+    def __init__(self, directory, max_size=CACHE_SIZE):
+        """
+        Initialise the cache.
+        :param directory:  The directory to keep results in
+        :param max_size:  The size in bytes to keep the results within
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_size = max_size
+
+    def path(self, key):
+        """Return the path of the file holding the result for a key."""
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def get(self, key):
+        """Return the result for a key, or None if it is not cached."""
+        try:
+            result = np.load(self.path(key))
+            os.utime(self.path(key))
+        except (OSError, ValueError):
+            return None
+        return result
+
+    def put(self, key, result):
+        """Cache a result, evicting others if the cache is too large."""
+        handle, temporary = tempfile.mkstemp(self.EXTENSION,
+                                             dir=self.directory)
+        with os.fdopen(handle, "wb") as f:
+            np.save(f, result)
+        os.replace(temporary, self.path(key))
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used results beyond the maximum size."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def __contains__(self, key):
+        """Return whether a result is cached for a key."""
+        return os.path.exists(self.path(key))
+
+
+def _project_point(point, key, n_games, seed, win_probability, cards,
+                   max_rounds):
+    """Project a single point, seeded by its key."""
+    seed = [int(key[:16], 16)] + ([] if seed is None else [seed])
+    return project(point.starting_value, point.n_players, n_games,
+                   OrderedDict(point.stakes), win_probability, cards,
+                   max_rounds, seed=seed, workers=1)
+
+
+def sweep(points, n_games=10000, cache=None, seed=0, win_probability=None,
+          cards=None, max_rounds=1000, workers=None):
+    """
+    Project games for each point, spread over a pool of processes, reusing
+    any results already in the cache.
+
+    Each point is seeded by its key, so its results don't depend on the
+    other points in the sweep.
+    :param points:  The points to project, e.g. from grid
+    :param n_games:  The number of games to simulate per point
+    :param cache:  A ResultCache, or None not to cache results
+    :param seed:  Seed for reproducible sweeps
+    :param workers:  The number of processes to simulate with
+    :return:  A dict of the rounds each player went out, for each point, as
+              returned by project
+    """
+    win_probability = win_probability or DEFAULT_WIN_PROBABILITY
+    cards = cards or PoissonCards()
+    settings = (n_games, seed, win_probability, cards, max_rounds)
+    keys = OrderedDict((point, point_key(point, *settings))
+                       for point in points)
+
+    results = OrderedDict()
+    missing = []
+    for point, key in keys.items():
+        cached = cache.get(key) if cache is not None else None
+        if cached is None:
+            missing.append(point)
+        else:
+            results[point] = cached
+
+    def store(point, result):
+        """Keep a computed result, caching it as soon as it's ready."""
+        if cache is not None:
+            cache.put(keys[point], result)
+        results[point] = result
+
+    args = [(point, keys[point]) + settings for point in missing]
+    if workers == 1 or len(args) < 2:
+        for point, a in zip(missing, args):
+            store(point, _project_point(*a))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for point, result in zip(
+                missing, executor.map(_project_point, *zip(*args))
+            ):
+                store(point, result)
+    return OrderedDict((point, results[point]) for point in keys)
+
+
+def parse_stakes(text):
+    """Return the stakes with changes given as e.g. 'Game=2,9 Diamonds=4'."""
+    stakes = OrderedDict(SEGMENTS)
+    for change in filter(None, text.split(",")):
+        segment, _, value = change.partition("=")
+        if segment.strip() not in stakes:
+            raise ValueError(f"Unknown segment {segment.strip()}")
+        stakes[segment.strip()] = int(value)
+    return stakes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stakes", action="append", type=parse_stakes,
+                        help="Changes to the stakes, e.g. 'Game=2,Ace=2', "
+                             "repeated for each variant")
+    parser.add_argument("--starting-values", type=int, nargs="+",
+                        default=[50])
+    parser.add_argument("--players", type=int, nargs="+",
+                        default=list(range(2, PlayerList.MAX_PLAYERS + 1)))
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--cache", default=os.path.join(
+        os.path.expanduser("~"), ".cache", "pope-joan", "sweep"
+    ))
+    parser.add_argument("--cache-size", type=float, default=CACHE_SIZE / 1e6,
+                        help="Maximum size of the cache in megabytes")
+    args = parser.parse_args()
+
+    stakes = args.stakes or [SEGMENTS]
+    results = sweep(
+        grid(stakes, args.starting_values, args.players), args.games,
+        ResultCache(args.cache, int(args.cache_size * 1e6)), args.seed,
+        workers=args.workers,
+    )
+    print("Variant  Start  Players  Median rounds  Finished")
+    for point, rounds_out in results.items():
+        lengths = game_lengths(rounds_out)
+        lengths = lengths[lengths != STILL_IN]
+        median = np.median(lengths) if len(lengths) else np.nan
+        variant = stakes.index(OrderedDict(point.stakes)) + 1
+        print(f"{variant:<8} {point.starting_value:<6} {point.n_players:<8} "
+              f"{median:<14.0f} {len(lengths) / len(rounds_out):.1%}")
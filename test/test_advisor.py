@@ -0,0 +1,67 @@
+import random
+import unittest
+
+from table.advisor import Advisor, payoff, sample
+from table.engine import (
+    Hand,
+    PLAYED,
+    WIDOW,
+    deal,
+    parse_card,
+    parse_cards,
+)
+from table.scorer import SEGMENTS
+
+
+class AdvisorTest(unittest.TestCase):
+    """Test advice on which card to lead."""
+
+    def setUp(self):
+        """Set up a hand where leading the King wins outright."""
+        self.hand = Hand(
+            [parse_cards("KS", "5H"), parse_cards("6H", "2D", "3S"),
+             parse_cards("9C", "4S")],
+            parse_cards("10C", "5S"), trump_card=parse_card("10C"), dealer=2
+        )
+
+    def test_sample(self):
+        """Test that sampled hands are consistent with what's known."""
+        hand = deal(4, dealer=1, rng=random.Random(2))
+        hand.lead(hand.legal_leads()[0])
+        rng = random.Random(3)
+        for _ in range(20):
+            other = sample(hand, 2, rng)
+            self.assertEqual(hand.hands[2], other.hands[2])
+            self.assertEqual([len(c) for c in hand.hands],
+                             [len(c) for c in other.hands])
+            self.assertEqual(hand.owner.count(WIDOW),
+                             other.owner.count(WIDOW))
+            for c in hand.known_widow | {hand.trump_card}:
+                self.assertEqual(WIDOW, other.owner[c])
+            for c in hand.played:
+                self.assertEqual(PLAYED, other.owner[c])
+
+    def test_payoff(self):
+        """Test scoring a round's result for a single seat."""
+        segment_winners = {s: "" for s in SEGMENTS}
+        segment_winners.update({"Game": 1, "Ace": 1, "King": 0})
+        player_cards = {0: 3, 1: 0, 2: 4}
+        pots = dict(SEGMENTS)
+        self.assertEqual(-2, payoff(0, segment_winners, player_cards, pots))
+        self.assertEqual(9, payoff(1, segment_winners, player_cards, pots))
+        self.assertEqual(-4, payoff(2, segment_winners, player_cards, pots))
+
+    def test_advise(self):
+        """Test that the best lead is ranked first."""
+        with Advisor(time_budget=0.05, workers=1) as advisor:
+            advice = advisor.advise(self.hand, 0)
+        self.assertEqual(parse_cards("KS", "5H"), list(advice))
+        # Winning the game and the card counts from the other hands
+        self.assertEqual(6, advice[parse_card("KS")])
+
+    def test_advise_in_parallel(self):
+        """Test spreading simulations over several processes."""
+        with Advisor(time_budget=0.05, workers=2) as advisor:
+            advice = advisor.advise(self.hand, 0, pots=dict(SEGMENTS, Game=10))
+        self.assertEqual(parse_cards("KS", "5H"), list(advice))
+        self.assertEqual(15, advice[parse_card("KS")])
@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+from copy import copy
+
+from PyQt5.QtGui import QImage
+
+from table.capture import BoardCapture, render_board, render_session
+from table.main import TableView
+from table.scorer import Phase
+from table.snapshot import loads
+
+TEST_PLAYERS = ["Ant", "Dec"]
+
+
+class CaptureTest(unittest.TestCase):
+    """Test capturing images of the board after each round."""
+
+    def setUp(self):
+        """Initialise a table, capturing into a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.table = TableView(50, copy(TEST_PLAYERS))
+        self.capture = BoardCapture(self.directory.name, queue_size=1)
+        self.capture.attach(self.table)
+
+    def tearDown(self):
+        """Remove the captured images."""
+        self.directory.cleanup()
+
+    def play_round(self):
+        """Dress the board, win the game and the Ace, and leave cards."""
+        self.table.dress(self.table.q_players[self.table.scorer.dresser])
+        self.table.q_board.winners["Game"].setCurrentIndex(1)
+        self.table.q_board.winners["Ace"].setCurrentIndex(2)
+        self.table.q_players[self.table.scorer.players[1]].cards.setText("3")
+        self.table.end_round()
+
+    def read(self, name):
+        """Return the contents of a captured file."""
+        with open(os.path.join(self.directory.name, name), "rb") as f:
+            return f.read()
+
+    def test_capture_rounds(self):
+        """Test that an image and snapshot are written for each round."""
+        for _ in range(3):
+            self.play_round()
+        self.capture.close()
+        self.assertEqual(
+            [f"game_01_round_000{i}.{ext}" for i in (1, 2, 3)
+             for ext in ("json", "pjs", "png")],
+            sorted(os.listdir(self.directory.name))
+        )
+        image = QImage(os.path.join(self.directory.name,
+                                    "game_01_round_0003.png"))
+        self.assertEqual(
+            render_board(self.table.q_board, {"Ant": 0, "Dec": 3}).size(),
+            image.size()
+        )
+
+    def test_results(self):
+        """Test that the round is captured as scored, before it's cleared."""
+        self.play_round()
+        self.capture.close()
+        snapshot = loads(self.read("game_01_round_0001.pjs"))
+        self.assertEqual((1, Phase.SCORING), (snapshot.round, snapshot.phase))
+        result = json.loads(self.read("game_01_round_0001.json"))
+        self.assertEqual("Ant", result["segment_winners"]["Game"])
+        self.assertEqual("Dec", result["segment_winners"]["Ace"])
+        self.assertEqual({"Ant": 0, "Dec": 3}, result["player_cards"])
+
+        # The image shows the winners selected, unlike the cleared board
+        image = QImage(os.path.join(self.directory.name,
+                                    "game_01_round_0001.png"))
+        self.assertNotEqual(render_board(self.table.q_board,
+                                         result["player_cards"]), image)
+        os.remove(os.path.join(self.directory.name, "game_01_round_0001.png"))
+        render_session(self.directory.name)
+        self.assertEqual(image, QImage(os.path.join(
+            self.directory.name, "game_01_round_0001.png"
+        )))
+
+    def test_new_game(self):
+        """Test that a new game's rounds don't overwrite the last game's."""
+        self.play_round()
+        self.table.new_game(30, ["X", "Y", "Z"])
+        self.play_round()
+        self.capture.close()
+        self.assertEqual(TEST_PLAYERS, list(
+            loads(self.read("game_01_round_0001.pjs")).players
+        ))
+        self.assertEqual(["X", "Y", "Z"], list(
+            loads(self.read("game_02_round_0001.pjs")).players
+        ))
+
+    def test_render_session(self):
+        """Test regenerating the images of a captured session."""
+        for _ in range(2):
+            self.play_round()
+        self.table.new_game(30, ["X", "Y", "Z"])
+        self.play_round()
+        self.capture.close()
+        for name in os.listdir(self.directory.name):
+            if name.endswith(".png"):
+                os.remove(os.path.join(self.directory.name, name))
+        paths = render_session(self.directory.name)
+        self.assertEqual(["game_01_round_0001.png", "game_01_round_0002.png",
+                          "game_02_round_0001.png"],
+                         [os.path.basename(p) for p in paths])
+        for path in paths:
+            self.assertFalse(QImage(path).isNull())
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from table.checker import (
+    Drop,
+    Dress,
+    Failure,
+    Score,
+    check,
+    check_actions,
+)
+from table.scorer import Phase, Scorer
+
+
+def broken_dress(scorer, player):
+    """Dress the board, losing a counter."""
+    segments, players = map(dict, scorer.balance)
+    players[player] -= 1
+    scorer._advance(scorer.snapshot(), segments, players)
+
+
+# Where stand-in shards record that they ran, set before forking workers
+SHARD_LOG = None
+
+
+def fail_first_shard(seed, n_sequences, length, reference):
+    """Stand in for checking a shard, failing the first, larger one."""
+    open(os.path.join(SHARD_LOG, str(seed)), "w").close()
+    if n_sequences == 2:
+        return Failure(50, 2, [Dress()], 0, "Counters are not conserved")
+    time.sleep(0.3)
+    return None
+
+
+class CheckerTest(unittest.TestCase):
+    """Test randomised checking of the scorer."""
+
+    def test_scorer_invariants(self):
+        """Test that random games don't break any invariants."""
+        self.assertIsNone(check(300, length=40, seed=0, workers=1))
+
+    def test_sharded(self):
+        """Test checking shards of games over several processes."""
+        self.assertIsNone(check(40, length=20, seed=1, workers=2))
+
+    def test_dresser_out_while_scoring(self):
+        """Test that a dresser going out while scoring finishes the round."""
+        scorer = Scorer(8, ["Anne", "Bob", "Cat"])
+        scorer.log_dress("Anne")
+        scorer.drop("Anne")
+        self.assertEqual(Phase.SCORING, scorer.phase)
+        scorer.log_round({"Game": "Cat"}, {})
+        self.assertEqual("Bob", scorer.dresser)
+
+    def test_illegal_actions_skipped(self):
+        """Test that actions not possible at the table are ignored."""
+        actions = [Score((0,) * 8, (0, 0)), Drop(1), Dress(), Dress()]
+        self.assertIsNone(check_actions(50, 2, actions))
+
+    def test_shrink(self):
+        """Test that failures are shrunk to a minimal sequence."""
+        with mock.patch.object(Scorer, "log_dress", broken_dress):
+            failure = check(50, length=30, seed=2, workers=1)
+        self.assertEqual([Dress()], failure.actions)
+        self.assertEqual(0, failure.step)
+        self.assertEqual("Counters are not conserved", failure.message)
+
+    def test_stop_after_failure(self):
+        """Test that shards not yet started are cancelled after a failure."""
+        global SHARD_LOG
+        with tempfile.TemporaryDirectory() as SHARD_LOG, \
+                mock.patch.object(Scorer, "log_dress", broken_dress), \
+                mock.patch("table.checker._check_shard", fail_first_shard):
+            failure = check(21, seed=3, workers=2, shards=20)
+            self.assertEqual([Dress()], failure.actions)
+            # Only the shards already running were left to finish
+            started = len(os.listdir(SHARD_LOG))
+            time.sleep(0.5)
+            self.assertEqual(started, len(os.listdir(SHARD_LOG)))
+            self.assertLess(started, 20)
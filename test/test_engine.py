@@ -0,0 +1,180 @@
+import random
+import unittest
+
+from table.engine import (
+    DECK,
+    Hand,
+    RandomPolicy,
+    card_name,
+    deal,
+    longest_run,
+    lowest_card,
+    parse_card,
+    parse_cards,
+    play_round,
+    round_result,
+)
+from table.scorer import SEGMENTS, Scorer
+
+TEST_PLAYERS = ["North", "East", "South", "West"]
+
+
+class EngineTest(unittest.TestCase):
+    """Test playing out hands of Pope Joan."""
+
+    def test_deal(self):
+        """Test that every card is dealt exactly once."""
+        hand = deal(4, dealer=2, rng=random.Random(1))
+        dealt = [c for cards in hand.hands for c in cards]
+        widow = [c for c in DECK if hand.owner[c] < 0]
+        self.assertEqual(sorted(DECK), sorted(dealt + widow))
+        self.assertIn(hand.trump_card, widow)
+        self.assertEqual(3, hand.leader)
+
+    def test_sequence_and_stops(self):
+        """Test sequences passing between players until a stop."""
+        hand = Hand(
+            [parse_cards("2C", "5C", "KH"), parse_cards("3C", "4C", "9H"),
+             parse_cards("6C", "AH")],
+            parse_cards("7C", "2S"), trump_card=parse_card("2S"), dealer=2
+        )
+        hand.lead(parse_card("2C"))
+        self.assertEqual(parse_cards("2C", "3C", "4C", "5C", "6C"),
+                         hand.played)
+        # 7C is in the widow, so the player of 6C leads next
+        self.assertEqual(2, hand.leader)
+        hand.lead(parse_card("AH"))
+        self.assertEqual("Game", next(
+            s for s, seat in hand.winners.items() if seat == 2
+        ))
+
+    def test_honours(self):
+        """Test winning trump honours, Intrigue, Matrimony and the Game."""
+        hand = Hand(
+            [parse_cards("JH", "QH", "KH", "2C", "6S"),
+             parse_cards("AH", "3C", "4C"), parse_cards("9D", "10D", "5S")],
+            parse_cards("2H"), trump_card=parse_card("2H"), dealer=2
+        )
+        hand.lead(parse_card("JH"))
+        hand.lead(parse_card("2C"))
+        self.assertEqual(1, hand.leader)
+        hand.lead(parse_card("AH"))
+        self.assertTrue(hand.finished)
+        segment_winners, player_cards = hand.result(["N", "E", "S"])
+        self.assertEqual({
+            "Game": "E", "Ace": "E", "Jack": "N", "Intrigue": "N",
+            "Queen": "N", "Matrimony": "N", "King": "N", "9 Diamonds": "",
+        }, segment_winners)
+        # The holder of the Pope doesn't pay for their cards
+        self.assertEqual({"N": 1, "E": 0, "S": 0}, player_cards)
+
+    def test_pair_in_either_order(self):
+        """Test winning pairs when the higher honour is played first."""
+        hand = Hand(
+            [parse_cards("KH", "QH", "JH", "2C", "3C"),
+             parse_cards("4C", "5C")],
+            parse_cards("2H"), trump_card=parse_card("2H"), dealer=1
+        )
+        hand.lead(parse_card("KH"))
+        hand.lead(parse_card("QH"))
+        self.assertIsNone(hand.winners["Intrigue"])
+        hand.lead(parse_card("JH"))
+        self.assertEqual({"Jack": 0, "Queen": 0, "King": 0, "Intrigue": 0,
+                          "Matrimony": 0},
+                         {s: hand.winners[s] for s in
+                          ("Jack", "Queen", "King", "Intrigue", "Matrimony")})
+
+    def test_pope_played(self):
+        """Test winning the Pope by playing the nine of diamonds."""
+        hand = Hand([parse_cards("9D", "10D", "2C"), parse_cards("3C")],
+                    parse_cards("JD"),
+                    trump_card=parse_card("JD"), dealer=1)
+        hand.lead(parse_card("9D"))
+        self.assertEqual(0, hand.winners["9 Diamonds"])
+        self.assertEqual(1, hand.winners["Jack"])
+
+    def test_pope_turned_up(self):
+        """Test the dealer winning the Pope and the Game when turned up."""
+        hand = Hand([parse_cards("2C"), parse_cards("3C")], parse_cards("9D"),
+                    trump_card=parse_card("9D"), dealer=0)
+        self.assertTrue(hand.finished)
+        segment_winners, player_cards = hand.result(["N", "E"])
+        self.assertEqual("N", segment_winners["Game"])
+        self.assertEqual("N", segment_winners["9 Diamonds"])
+        self.assertEqual({"N": 0, "E": 0}, player_cards)
+
+    def test_round_result(self):
+        """Test deducing the segment winners and cards left."""
+        segment_winners, player_cards = round_result(
+            ["Ann", "Ben", "Cal"],
+            {"Ann": parse_cards("2C", "3C"), "Ben": [],
+             "Cal": parse_cards("9D", "KS")},
+            {"Ann": parse_cards("JH", "QH"), "Ben": parse_cards("AH", "KH")},
+            trump_card=parse_card("4H"), dealer="Cal",
+        )
+        self.assertEqual({
+            "Game": "Ben", "Ace": "Ben", "Jack": "Ann", "Intrigue": "Ann",
+            "Queen": "Ann", "Matrimony": "", "King": "Ben",
+            "9 Diamonds": "",
+        }, segment_winners)
+        self.assertEqual({"Ann": 2, "Ben": 0, "Cal": 0}, player_cards)
+
+    def test_round_result_turned_up(self):
+        """Test the dealer winning an honour or the Pope turned up."""
+        segment_winners, _ = round_result(
+            ["Ann", "Ben"], {"Ann": parse_cards("2C"), "Ben": []},
+            {"Ann": parse_cards("QS"), "Ben": parse_cards("JS")},
+            trump_card=parse_card("KS"), dealer="Ann",
+        )
+        self.assertEqual(("Ann", "Ben", "Ann", ""),
+                         tuple(segment_winners[s] for s in
+                               ("King", "Jack", "Queen", "Matrimony")))
+        segment_winners, player_cards = round_result(
+            ["Ann", "Ben"],
+            {"Ann": parse_cards("2C"), "Ben": parse_cards("3C")}, {},
+            trump_card=parse_card("9D"), dealer="Ben",
+        )
+        self.assertEqual("Ben", segment_winners["Game"])
+        self.assertEqual("Ben", segment_winners["9 Diamonds"])
+        self.assertEqual({"Ann": 0, "Ben": 0}, player_cards)
+
+    def test_result_matches_play(self):
+        """Test that the winners found in play agree with the result."""
+        rng = random.Random(5)
+        for _ in range(300):
+            n_players = rng.randint(2, 4)
+            hand = deal(n_players, rng.randrange(n_players), rng)
+            hand.play([RandomPolicy(rng)] * n_players)
+            segment_winners, _ = hand.result(TEST_PLAYERS[:n_players])
+            self.assertEqual(
+                {s: "" if seat is None else TEST_PLAYERS[seat]
+                 for s, seat in hand.winners.items()},
+                segment_winners
+            )
+
+    def test_card_names(self):
+        """Test the short names of cards."""
+        self.assertEqual(["AC", "9D", "10H", "KS"],
+                         [card_name(c) for c in
+                          parse_cards("AC", "9D", "10H", "KS")])
+
+    def test_scorer_consumes_results(self):
+        """Test scoring many played rounds with the scorer."""
+        rng = random.Random(5)
+        policies = {"North": longest_run, "East": RandomPolicy(rng),
+                    "South": lowest_card}
+        scorer = Scorer(1000, list(TEST_PLAYERS))
+        for _ in range(200):
+            scorer.log_dress(scorer.dresser)
+            segment_winners, player_cards = play_round(
+                scorer.players, scorer.dresser, policies, rng
+            )
+            self.assertEqual(list(SEGMENTS), list(segment_winners))
+            self.assertIn(segment_winners["Game"], TEST_PLAYERS)
+            self.assertEqual(0, player_cards[segment_winners["Game"]])
+            scorer.log_round(segment_winners, player_cards)
+        self.assertEqual(
+            1000 * len(TEST_PLAYERS),
+            sum(scorer.balance.players.values())
+            + sum(scorer.balance.segments.values())
+        )
@@ -0,0 +1,172 @@
+import os
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+
+from table.feed import FeedError, FeedPublisher, FeedReader, feed_path
+from table.main import TableView
+from table.scorer import Scorer
+from table.snapshot import dumps
+
+TEST_PLAYERS = ["Morecambe", "Wise", "Cannon", "Ball"]
+N_UPDATES = 5000
+
+
+def read_remotely(name):
+    """Read the latest state in another process."""
+    reader = FeedReader(name)
+    try:
+        sequence, scorer = reader.read()
+        return sequence, dumps(scorer)
+    finally:
+        reader.close()
+
+
+def watch(name):
+    """
+    Read a feed in another process until the last update, returning the
+    number of distinct states seen and any that were inconsistent.
+    """
+    reader = FeedReader(name)
+    seen, torn = 0, []
+    latest = None
+    try:
+        while True:
+            update = reader.read(latest)
+            if update is None:
+                continue
+            latest, scorer = update
+            seen += 1
+            # Every published state conserves the counters
+            total = sum(scorer.balance.players.values()) + \
+                sum(scorer.balance.segments.values())
+            if total != 20 * len(TEST_PLAYERS):
+                torn.append((scorer.round, scorer.phase, total))
+            if scorer.round == N_UPDATES + 1:
+                return seen, torn
+    finally:
+        reader.close()
+
+
+class FeedTest(unittest.TestCase):
+    """Test the live feed of the game state."""
+
+    def setUp(self):
+        """Create a feed."""
+        self.name = f"test-{os.getpid()}"
+        self.publisher = FeedPublisher(self.name)
+
+    def tearDown(self):
+        """Remove the feed."""
+        self.publisher.close()
+
+    def test_read_latest(self):
+        """Test reading the latest state, and only when it changes."""
+        reader = FeedReader(self.name)
+        self.assertIsNone(reader.read())
+        scorer = Scorer(20, copy(TEST_PLAYERS))
+        self.publisher.publish(scorer)
+        sequence, read = reader.read()
+        self.assertEqual(dumps(scorer), dumps(read))
+        self.assertIsNone(reader.read(sequence))
+
+        scorer.log_dress("Morecambe")
+        self.publisher.publish(scorer)
+        sequence, read = reader.read(sequence)
+        self.assertEqual(dumps(scorer), dumps(read))
+        reader.close()
+
+    def test_table(self):
+        """Test that a table's state is published as it changes."""
+        table = TableView(20, copy(TEST_PLAYERS))
+        self.publisher.attach(table)
+        table.dress(table.q_players["Morecambe"])
+        table.drop(table.q_players["Ball"])
+        with ProcessPoolExecutor(1) as executor:
+            sequence, snapshot = executor.submit(
+                read_remotely, self.name
+            ).result()
+        self.assertEqual(dumps(table.scorer), snapshot)
+        self.assertEqual(self.publisher.sequence, sequence)
+
+    def test_concurrent_readers(self):
+        """Test that readers never see a partly written state."""
+        scorer = Scorer(20, copy(TEST_PLAYERS))
+        with ProcessPoolExecutor(2) as executor:
+            futures = [executor.submit(watch, self.name)
+                       for _ in range(2)]
+            for i in range(N_UPDATES):
+                scorer.log_dress(scorer.dresser)
+                self.publisher.publish(scorer)
+                winner = TEST_PLAYERS[i % len(TEST_PLAYERS)]
+                scorer.log_round(
+                    {"Game": winner, "9 Diamonds": winner},
+                    {player: i % 5 for player in TEST_PLAYERS}
+                )
+                self.publisher.publish(scorer)
+            for future in futures:
+                seen, torn = future.result()
+                self.assertGreater(seen, 0)
+                self.assertEqual([], torn)
+
+    def test_restart(self):
+        """Test that a reader follows a feed that is closed and recreated."""
+        reader = FeedReader(self.name)
+        scorer = Scorer(20, copy(TEST_PLAYERS))
+        self.publisher.publish(scorer)
+        sequence, _ = reader.read()
+        self.publisher.close()
+        self.assertIsNone(reader.read(sequence))
+
+        self.publisher = FeedPublisher(self.name)
+        scorer.log_dress("Morecambe")
+        self.publisher.publish(scorer)
+        self.assertEqual(sequence, self.publisher.sequence)
+        update = reader.read(sequence)
+        self.assertIsNotNone(update)
+        self.assertEqual(dumps(scorer), dumps(update[1]))
+        reader.close()
+
+    def test_left_behind(self):
+        """
+        Test reopening a feed whose publisher stopped partway through an
+        update, without closing it.
+        """
+        reader = FeedReader(self.name, timeout=0.01)
+        scorer = Scorer(20, copy(TEST_PLAYERS))
+        self.publisher.publish(scorer)
+        sequence, _ = reader.read()
+        # Stop partway through the next update
+        self.publisher.memory[8] += 1
+        self.publisher.memory.close()
+        self.assertIsNone(reader.read(sequence))
+
+        self.publisher = FeedPublisher(self.name)
+        self.assertIsNone(reader.read(sequence))
+        scorer.log_dress("Morecambe")
+        self.publisher.publish(scorer)
+        self.assertGreater(self.publisher.sequence, sequence)
+        update = reader.read(sequence)
+        self.assertEqual((self.publisher.sequence, dumps(scorer)),
+                         (update[0], dumps(update[1])))
+        reader.close()
+
+    def test_not_a_feed(self):
+        """Test that other shared memory is rejected."""
+        path = feed_path(f"{self.name}-other")
+        with open(path, "wb") as f:
+            f.write(bytes(64))
+        try:
+            with self.assertRaises(FeedError):
+                FeedReader(f"{self.name}-other")
+        finally:
+            os.remove(path)
+
+    def test_capacity(self):
+        """Test that a snapshot too large for the feed is rejected."""
+        publisher = FeedPublisher(f"{self.name}-small", capacity=16)
+        try:
+            with self.assertRaises(ValueError):
+                publisher.publish(Scorer(20, copy(TEST_PLAYERS)))
+        finally:
+            publisher.close()
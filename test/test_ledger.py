@@ -0,0 +1,127 @@
+import random
+import unittest
+
+from table.ledger import BANK, Ledger, Transfer, player, segment
+from table.scorer import SEGMENTS, Scorer
+from table.snapshot import dumps, loads
+
+TEST_PLAYERS = ["Ann", "Bob", "Cat"]
+
+
+class LedgerTest(unittest.TestCase):
+    """Test the ledger of counters transferred."""
+
+    def test_opening_balances(self):
+        """Test that opening balances are paid from the bank."""
+        ledger = Ledger({"Ann": 20, "Bob": 0}, {"Game": 3})
+        self.assertEqual([Transfer(0, BANK, player("Ann"), 20),
+                          Transfer(0, BANK, segment("Game"), 3)],
+                         list(ledger))
+        self.assertEqual(20, ledger.balance(player("Ann"), 0))
+        self.assertEqual(-23, ledger.balance(BANK, 10))
+
+    def test_against_rescan(self):
+        """Test queries against scanning every transfer, over many rounds."""
+        for capacity in (4, 10):
+            with self.subTest(capacity=capacity):
+                self.check_against_rescan(capacity)
+
+    def check_against_rescan(self, capacity):
+        """Check random queries against scanning every transfer."""
+        rng = random.Random(4)
+        accounts = [player(p) for p in TEST_PLAYERS] + \
+            [segment(s) for s in SEGMENTS]
+        ledger = Ledger({p: 50 for p in TEST_PLAYERS}, SEGMENTS,
+                        capacity=capacity)
+        round_ = 0
+        for _ in range(3000):
+            round_ += rng.random() < 0.1
+            source, destination = rng.sample(accounts, 2)
+            ledger.record(round_, source, destination, rng.randint(-3, 9))
+        transfers = list(ledger)
+        self.assertEqual(len(ledger), len(transfers))
+
+        for _ in range(200):
+            first = rng.randint(0, round_)
+            last = rng.randint(first, round_ + 5)
+            a, b = rng.sample(accounts, 2)
+            self.assertEqual(
+                sum(t.amount for t in transfers
+                    if t.round <= last and t.destination == a)
+                - sum(t.amount for t in transfers
+                      if t.round <= last and t.source == a),
+                ledger.balance(a, last)
+            )
+            in_range = [t for t in transfers if first <= t.round <= last]
+            self.assertEqual(
+                sum(t.amount for t in in_range
+                    if (t.source, t.destination) == (a, b))
+                - sum(t.amount for t in in_range
+                      if (t.source, t.destination) == (b, a)),
+                ledger.net(a, b, first, last)
+            )
+            self.assertEqual(
+                sum(t.amount for t in in_range if t.destination == a)
+                - sum(t.amount for t in in_range if t.source == a),
+                ledger.flow(a, first, last)
+            )
+
+    def test_growth(self):
+        """Test balances as the ledger grows from an uneven capacity."""
+        ledger = Ledger({"A": 0, "B": 0}, {}, capacity=10)
+        for round_ in range(1, 41):
+            ledger.record(round_, player("A"), player("B"), 1)
+        for round_ in (0, 9, 15, 16, 20, 40, 50):
+            self.assertEqual(min(round_, 40),
+                             ledger.balance(player("B"), round_))
+        for tree in ledger._flows:
+            self.assertEqual(64 + 1, len(tree))
+
+    def test_order(self):
+        """Test that transfers can't be recorded in an earlier round."""
+        ledger = Ledger({"A": 0, "B": 0}, {})
+        ledger.record(3, player("A"), player("B"), 1)
+        ledger.record(3, player("B"), player("A"), 2)
+        with self.assertRaises(ValueError):
+            ledger.record(2, player("A"), player("B"), 1)
+        self.assertEqual(-1, ledger.net(player("A"), player("B"), 0, 3))
+
+    def test_scorer(self):
+        """Test that the scorer records who paid whom."""
+        scorer = Scorer(20, list(TEST_PLAYERS))
+        scorer.log_dress("Ann")
+        scorer.log_round({"Game": "Bob", "9 Diamonds": "Cat"},
+                         {"Ann": 3, "Bob": 2, "Cat": 4})
+        scorer.log_dress("Bob")
+        scorer.log_round({"Game": "Ann", "9 Diamonds": ""},
+                         {"Ann": 0, "Bob": 1, "Cat": 2})
+        ledger = scorer.ledger
+
+        self.assertEqual(4, ledger.net(player("Cat"), player("Bob"), 1, 1))
+        self.assertEqual(-2, ledger.net(player("Bob"), player("Ann"), 0, 2))
+        self.assertEqual(6, ledger.net(segment("9 Diamonds"), player("Cat"),
+                                       1, 2))
+        self.assertEqual(6, ledger.balance(segment("9 Diamonds"), 2))
+        for round_ in (0, 1, 2):
+            self.assertEqual(0, sum(ledger.balance(a, round_)
+                                    for a in ledger.accounts))
+        for name, balance in scorer.balance.players.items():
+            self.assertEqual(balance, ledger.balance(player(name), 2))
+        with self.assertRaises(ValueError):
+            ledger.record(1, player("Ann"), player("Ann"), 1)
+
+    def test_restored_scorer(self):
+        """Test that a restored ledger opens with the restored balances."""
+        scorer = Scorer(20, list(TEST_PLAYERS))
+        scorer.log_dress("Ann")
+        restored = loads(dumps(scorer))
+        self.assertEqual(
+            [Transfer(0, BANK, player(p), v)
+             for p, v in scorer.balance.players.items()]
+            + [Transfer(0, BANK, segment(s), v)
+               for s, v in scorer.balance.segments.items()],
+            list(restored.ledger)
+        )
+        restored.log_round({"Game": "Bob"}, {"Ann": 2})
+        self.assertEqual(2, restored.ledger.net(player("Ann"), player("Bob"),
+                                                1, 1))
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from table.projection import STILL_IN, UniformCards, game_lengths, project
+
+
+class ProjectionTest(unittest.TestCase):
+    """Test the game length projection."""
+
+    def test_every_game_has_a_winner(self):
+        """Test that all but one player goes out of each finished game."""
+        rounds_out = project(20, 5, n_games=500, seed=3, workers=1)
+        self.assertEqual((500, 5), rounds_out.shape)
+        np.testing.assert_array_equal(
+            np.ones(500), (rounds_out == STILL_IN).sum(axis=1)
+        )
+        lengths = game_lengths(rounds_out)
+        np.testing.assert_array_equal(rounds_out.max(axis=1), lengths)
+        self.assertTrue((lengths >= 1).all())
+
+    def test_reproducible(self):
+        """Test that projections are reproducible given a seed."""
+        first = project(30, 3, n_games=300, seed=7, chunk_size=100,
+                        workers=1)
+        second = project(30, 3, n_games=300, seed=7, chunk_size=100,
+                         workers=2)
+        np.testing.assert_array_equal(first, second)
+
+    def test_cannot_dress(self):
+        """Test that a player who can't dress goes out immediately."""
+        rounds_out = project(10, 2, n_games=50, seed=1, workers=1)
+        np.testing.assert_array_equal(np.full(50, 1), rounds_out[:, 0])
+        np.testing.assert_array_equal(np.full(50, STILL_IN),
+                                      rounds_out[:, 1])
+
+    def test_abandoned_games(self):
+        """Test that no player goes out without losses."""
+        rounds_out = project(1000, 4, n_games=50, cards=UniformCards(0, 0),
+                             max_rounds=20, seed=1, workers=1)
+        np.testing.assert_array_equal(np.full((50, 4), STILL_IN), rounds_out)
+        np.testing.assert_array_equal(np.full(50, STILL_IN),
+                                      game_lengths(rounds_out))
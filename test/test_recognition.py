@@ -0,0 +1,101 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+from PyQt5.QtGui import QImage
+
+from table.engine import DECK, parse_cards
+from table.recognition import (
+    TEMPLATE_SIZE,
+    load_templates,
+    match,
+    read_round,
+    recognise_files,
+    to_array,
+)
+
+TEMPLATES = load_templates()
+
+
+def save_photo(path, photo_cards, seed=0):
+    """
+    Save a synthetic photo of cards laid out in a row, with uneven lighting
+    and noise, standing in for a camera.
+    """
+    rng = np.random.default_rng(seed)
+    h, w = TEMPLATE_SIZE
+    templates = dict(zip(*TEMPLATES))
+    photo = np.full((h + 40, (w + 24) * max(len(photo_cards), 1) + 30), 0.35)
+    for i, c in enumerate(photo_cards):
+        row, col = 20 + rng.integers(-8, 8), 20 + i * (w + 24)
+        photo[row:row + h, col:col + w] = templates[c]
+    photo = 0.1 + 0.8 * photo * np.linspace(0.85, 1, photo.shape[1])
+    photo += rng.normal(0, 0.03, photo.shape)
+    data = np.clip(255 * photo, 0, 255).astype(np.uint8)
+    image = QImage(data.tobytes(), data.shape[1], data.shape[0],
+                   data.shape[1], QImage.Format_Grayscale8)
+    image.save(path)
+
+
+class RecognitionTest(unittest.TestCase):
+    """Test recognising cards in photos of the table."""
+
+    def setUp(self):
+        """Create a folder for sample photos."""
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the sample photos."""
+        self.directory.cleanup()
+
+    def path(self, name):
+        """Return the path to a sample photo."""
+        return os.path.join(self.directory.name, name)
+
+    def test_recognise_deck(self):
+        """Test recognising every card in a batch of photos."""
+        deck = list(DECK)
+        random.Random(1).shuffle(deck)
+        photos = {self.path(f"{i}.png"): deck[i:i + 6]
+                  for i in range(0, len(deck), 6)}
+        for seed, (path, photo_cards) in enumerate(photos.items()):
+            save_photo(path, photo_cards, seed)
+        found = recognise_files(list(photos), TEMPLATES, workers=2)
+        self.assertEqual(photos, dict(found))
+
+    def test_tiles(self):
+        """Test that matching in small tiles finds the same cards."""
+        save_photo(self.path("row.png"),
+                   parse_cards("AS", "9D", "KH", "2C", "JD"))
+        image = to_array(QImage(self.path("row.png")))
+        whole = match(image, *TEMPLATES)
+        tiled = match(image, *TEMPLATES, tile=70, memory=1)
+        self.assertEqual(5, len(whole))
+        self.assertEqual([(c, p) for c, _, p in whole],
+                         [(c, p) for c, _, p in tiled])
+        for (_, a, _), (_, b, _) in zip(whole, tiled):
+            self.assertAlmostEqual(a, b, places=4)
+
+    def test_empty_photo(self):
+        """Test that nothing is found in a photo without cards."""
+        save_photo(self.path("empty.png"), [])
+        found = recognise_files([self.path("empty.png")], TEMPLATES)
+        self.assertEqual([], found[self.path("empty.png")])
+
+    def test_read_round(self):
+        """Test reading a round from a folder of photos."""
+        save_photo(self.path("trump.png"), parse_cards("5S"), 1)
+        save_photo(self.path("Ann.hand.png"), parse_cards("2C", "10H", "QD"),
+                   2)
+        save_photo(self.path("Ann.played.png"), parse_cards("9D", "KS"), 3)
+        save_photo(self.path("Ben.played.png"), parse_cards("AS"), 4)
+        segment_winners, player_cards = read_round(
+            self.directory.name, ["Ann", "Ben"], "Ann", TEMPLATES, workers=1
+        )
+        self.assertEqual("Ben", segment_winners["Game"])
+        self.assertEqual("Ben", segment_winners["Ace"])
+        self.assertEqual("Ann", segment_winners["King"])
+        self.assertEqual("Ann", segment_winners["9 Diamonds"])
+        self.assertEqual({"Ann": 3, "Ben": 0}, dict(player_cards))
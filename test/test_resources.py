@@ -0,0 +1,25 @@
+import unittest
+
+from table.resources import background_image, icon
+
+
+class ResourcesTest(unittest.TestCase):
+    """Test loading the image resources."""
+
+    def test_loaded_once(self):
+        """Test that decoded resources are shared between users."""
+        self.assertIs(background_image(), background_image())
+        self.assertIs(background_image(), background_image(1.0))
+        self.assertIs(background_image(), background_image(1.001))
+        self.assertIs(icon(), icon())
+        self.assertFalse(background_image().isNull())
+        self.assertFalse(icon().isNull())
+
+    def test_scaled(self):
+        """Test pre-scaling the background image."""
+        image = background_image()
+        scaled = background_image(0.5)
+        self.assertIs(scaled, background_image(0.5))
+        self.assertIs(scaled, background_image(0.501))
+        self.assertEqual(round(image.width() / 2), scaled.width())
+        self.assertEqual(round(image.height() / 2), scaled.height())
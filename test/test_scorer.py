@@ -0,0 +1,92 @@
+import threading
+import unittest
+
+from table.scorer import Phase, Scorer, dress_value
+
+TEST_PLAYERS = ["Abbott", "Costello", "Laurel", "Hardy"]
+STARTING_VALUE = 1000
+
+
+def total(state):
+    """Return the counters on the board and held by players."""
+    return sum(state.balance.segments.values()) + \
+        sum(state.balance.players.values())
+
+
+class ScorerTest(unittest.TestCase):
+    """Test the scorer's published states."""
+
+    def setUp(self):
+        """Initialise a scorer."""
+        self.scorer = Scorer(STARTING_VALUE, list(TEST_PLAYERS))
+
+    def test_snapshots_immutable(self):
+        """Test that snapshots are unchanged by later play."""
+        before = self.scorer.snapshot()
+        self.scorer.log_dress("Abbott")
+        self.scorer.drop("Hardy")
+        self.assertEqual(0, before.version)
+        self.assertEqual(Phase.DRESSING, before.phase)
+        self.assertEqual(STARTING_VALUE, before.balance.players["Abbott"])
+        self.assertEqual(tuple(TEST_PLAYERS), before.players)
+        with self.assertRaises(TypeError):
+            before.balance.players["Abbott"] = 0
+        after = self.scorer.snapshot()
+        self.assertEqual(2, after.version)
+        self.assertEqual(("Abbott", "Costello", "Laurel"), after.players)
+
+    def test_drop_unknown_player(self):
+        """Test that dropping a player not in the game is an error."""
+        self.scorer.drop("Hardy")
+        with self.assertRaises(ValueError):
+            self.scorer.drop("Hardy")
+        self.assertEqual(1, self.scorer.version)
+
+    def test_concurrent_writers(self):
+        """Test that changes from several threads are all applied."""
+        n_threads, n_changes = 4, 500
+
+        # Each thread dresses as its own player, without reading the state
+        # outside the lock, so only the lock keeps the changes consistent
+        def play(player):
+            for _ in range(n_changes):
+                self.scorer.log_dress(player)
+
+        threads = [threading.Thread(target=play, args=(player,))
+                   for player in TEST_PLAYERS[:n_threads]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        state = self.scorer.snapshot()
+        self.assertEqual(n_threads * n_changes, state.version)
+        self.assertEqual(1 + n_threads * n_changes // 2, state.round)
+        self.assertEqual(STARTING_VALUE * len(TEST_PLAYERS), total(state))
+        for player in TEST_PLAYERS:
+            self.assertEqual(STARTING_VALUE - n_changes * dress_value(),
+                             state.balance.players[player])
+
+    def test_consistent_reads(self):
+        """Test that readers only see complete changes while play goes on."""
+        done = threading.Event()
+        torn = []
+
+        def read():
+            version = -1
+            while not done.is_set():
+                state = self.scorer.snapshot()
+                if state.version < version or \
+                        total(state) != STARTING_VALUE * len(TEST_PLAYERS):
+                    torn.append(state)
+                version = state.version
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for i in range(2000):
+            self.scorer.log_dress(self.scorer.dresser)
+            winner = TEST_PLAYERS[i % len(TEST_PLAYERS)]
+            self.scorer.log_round({"Game": winner, "Ace": winner},
+                                  {player: 3 for player in TEST_PLAYERS})
+        done.set()
+        reader.join()
+        self.assertEqual([], torn)
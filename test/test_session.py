@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from copy import copy
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+
+from table.main import TableView
+from table.replay import replay, summarise
+from table.session import SessionRecorder, read_session
+from table.snapshot import dumps
+
+TEST_PLAYERS = ["Laurel", "Hardy", "Chaplin"]
+
+
+class SessionTest(unittest.TestCase):
+    """Test recording and replaying sessions at the table."""
+
+    def setUp(self):
+        """Record a table to a temporary session file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.jsonl")
+        self.table = TableView(20, copy(TEST_PLAYERS))
+        self.recorder = SessionRecorder(self.path)
+        self.recorder.attach(self.table)
+
+    def tearDown(self):
+        """Remove the session file."""
+        self.directory.cleanup()
+
+    def select_winner(self, player_name, segment_name):
+        """Select a segment winner with the keyboard."""
+        winner = self.table.q_board.winners[segment_name]
+        for _ in range(self.table.scorer.players.index(player_name) + 1):
+            QTest.keyClick(winner, Qt.Key_Down)
+
+    def play_round(self, dresser, winner, cards):
+        """Play a round through the widgets."""
+        QTest.mouseClick(self.table.q_players[dresser].dress, Qt.LeftButton)
+        self.select_winner(winner, "Game")
+        self.select_winner(winner, "Intrigue")
+        for name, number in cards.items():
+            QTest.keyClicks(self.table.q_players[name].cards, str(number))
+        QTest.mouseClick(self.table.q_end_round, Qt.LeftButton)
+
+    def test_record(self):
+        """Test recording the semantic actions taken."""
+        self.play_round("Laurel", "Hardy", {"Laurel": 12})
+        self.recorder.close()
+        _, actions = read_session(self.path)
+        self.assertEqual(
+            [("dress", "Laurel"), ("winner", "Laurel"), ("winner", "Hardy"),
+             ("winner", "Laurel"), ("winner", "Hardy"), ("cards", "Laurel"),
+             ("cards", "Laurel"), ("end_round", None)],
+            [(a["action"], a.get("player")) for a in actions]
+        )
+        self.assertEqual("12", actions[6]["text"])
+        self.assertEqual("Intrigue", actions[4]["segment"])
+        times = [a["t"] for a in actions]
+        self.assertEqual(sorted(times), times)
+
+    def test_replay(self):
+        """Test that replaying a session reproduces the game."""
+        self.play_round("Laurel", "Hardy", {"Laurel": 12, "Chaplin": 3})
+        QTest.mouseClick(self.table.q_players["Laurel"].drop, Qt.LeftButton)
+        self.play_round("Hardy", "Chaplin", {"Hardy": 4})
+        self.table.new_game(30, ["Keaton", "Lloyd", "Tati", "Marx"])
+        self.play_round("Keaton", "Marx", {"Tati": 7})
+        self.recorder.close()
+
+        report = replay(self.path, show=False)
+        self.assertEqual(dumps(self.table.scorer), report.snapshot)
+        self.assertEqual(3, len(report.latencies["end_round"]))
+        self.assertEqual(1, len(report.latencies["new_game"]))
+        self.assertIn("end_round", summarise(report))
@@ -0,0 +1,81 @@
+import mmap
+import unittest
+
+from table.main import TableView
+from table.scorer import Phase, SEGMENTS, Scorer
+from table.snapshot import SnapshotError, dumps, loads
+
+TEST_PLAYERS = ["Anne", "Bob", "Chloë", "Dai"]
+
+
+class SnapshotTest(unittest.TestCase):
+    """Test encoding and decoding scorer snapshots."""
+
+    def setUp(self):
+        """Play part of a game."""
+        self.scorer = Scorer(50, list(TEST_PLAYERS))
+        self.scorer.log_dress("Anne")
+        self.scorer.log_round(
+            {"Game": "Bob", "Ace": "Dai", "Jack": ""},
+            {"Anne": 3, "Bob": 0, "Chloë": 7, "Dai": 2},
+        )
+        self.scorer.drop("Chloë")
+        self.scorer.log_dress("Bob")
+
+    def check_same_state(self, expected, actual):
+        """Check that two scorers hold the same state."""
+        self.assertEqual(expected.round, actual.round)
+        self.assertEqual(expected.phase, actual.phase)
+        self.assertEqual(expected.dresser, actual.dresser)
+        self.assertEqual(expected.players, actual.players)
+        self.assertEqual(list(expected.balance.players.items()),
+                         list(actual.balance.players.items()))
+        self.assertEqual(list(expected.balance.segments.items()),
+                         list(actual.balance.segments.items()))
+
+    def test_round_trip(self):
+        """Test that a decoded snapshot matches the original state."""
+        restored = loads(dumps(self.scorer))
+        self.check_same_state(self.scorer, restored)
+        self.assertEqual(Phase.SCORING, restored.phase)
+
+    def test_restored_game_continues(self):
+        """Test that play continues identically after restoring."""
+        restored = loads(dumps(self.scorer))
+        for scorer in (self.scorer, restored):
+            scorer.log_round({"Game": "Dai"}, {"Anne": 1, "Bob": 4})
+            scorer.log_dress(scorer.dresser)
+        self.check_same_state(self.scorer, restored)
+
+    def test_read_from_mmap(self):
+        """Test reading a snapshot at an offset within a mapped buffer."""
+        data = dumps(self.scorer)
+        with mmap.mmap(-1, len(data) + 16) as buffer:
+            buffer[16:] = data
+            self.check_same_state(self.scorer,
+                                  loads(memoryview(buffer), offset=16))
+
+    def test_invalid_buffer(self):
+        """Test that unreadable buffers are rejected."""
+        data = dumps(self.scorer)
+        self.assertRaises(SnapshotError, loads, b"")
+        self.assertRaises(SnapshotError, loads, b"XXXX" + data[4:])
+        self.assertRaises(SnapshotError, loads, data[:-3])
+        # The dresser, and the first seat, beyond the players
+        self.assertRaises(SnapshotError, loads, data[:12] + b"\7" + data[13:])
+        seats = 14 + 4 * (len(SEGMENTS) + len(TEST_PLAYERS))
+        self.assertEqual(bytes([0, 1, 3]), data[seats:seats + 3])
+        self.assertRaises(SnapshotError, loads,
+                          data[:seats] + b"\4" + data[seats + 1:])
+        self.assertRaises(SnapshotError, loads,
+                          data.replace(b"Dai", b"Bob"))
+
+    def test_table_from_snapshot(self):
+        """Test resuming the table display from a snapshot."""
+        table = TableView.from_snapshot(dumps(self.scorer))
+        self.check_same_state(self.scorer, table.scorer)
+        self.assertEqual("Round 2 - Scoring", table.title())
+        for name, player in table.q_players.players.items():
+            self.assertEqual(str(self.scorer.balance.players[name]),
+                             player.count.text())
+        self.assertFalse(table.q_players["Chloë"].isEnabled())
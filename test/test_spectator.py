@@ -0,0 +1,65 @@
+import unittest
+from copy import copy
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QApplication
+
+from table.main import TableView, Window
+from table.spectator import SpectatorWindow
+
+TEST_PLAYERS = ["Statler", "Waldorf"]
+
+
+class SpectatorTest(unittest.TestCase):
+    """Test the read-only spectator view of the board."""
+
+    def setUp(self):
+        """Open a spectator window onto a table."""
+        self.table = TableView(50, copy(TEST_PLAYERS))
+        self.window = SpectatorWindow(self.table)
+
+    def tearDown(self):
+        """Close the spectator window."""
+        self.window.close()
+
+    def test_shares_scene(self):
+        """Test that the spectator shows the board's own scene items."""
+        n_items = len(self.table.q_board.scene().items())
+        self.assertIs(self.table.q_board.scene(), self.window.view.scene())
+        self.assertFalse(self.window.view.isInteractive())
+        self.assertEqual(n_items, len(self.table.q_board.scene().items()))
+
+    def test_follows_table(self):
+        """Test that the spectator follows the state of the table."""
+        self.table.dress(self.table.q_players["Statler"])
+        self.assertEqual("Pope Joan - Round 1 - Scoring",
+                         self.window.windowTitle())
+
+    def test_zoom(self):
+        """Test zooming independently of the table's board."""
+        self.window.resize(800, 800)
+        QApplication.processEvents()
+        scale = self.window.view.transform().m11()
+        self.window.view.set_zoom(2)
+        self.assertAlmostEqual(2 * scale, self.window.view.transform().m11())
+        self.assertEqual(1, self.table.q_board.transform().m11())
+
+    def test_close(self):
+        """Test that closed spectator windows are deleted and forgotten."""
+        window = Window(50, copy(TEST_PLAYERS))
+        for _ in range(2):
+            window.open_spectator()
+        spectator = window.spectators[0]
+        refreshes = window.centralWidget().receivers(
+            window.centralWidget().refreshed
+        )
+        spectator.close()
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertEqual(1, len(window.spectators))
+        self.assertEqual(refreshes - 1, window.centralWidget().receivers(
+            window.centralWidget().refreshed
+        ))
+        window.spectators[0].close()
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.assertEqual([], window.spectators)
+        window.close()
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from collections import OrderedDict
+from unittest import mock
+
+import numpy as np
+
+from table import sweep as sweep_module
+from table.scorer import SEGMENTS
+from table.sweep import ResultCache, grid, parse_stakes, sweep
+
+
+class SweepTest(unittest.TestCase):
+    """Test sweeping projections over variants of the rules."""
+
+    def setUp(self):
+        """Create a temporary cache."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.directory.name)
+
+    def tearDown(self):
+        """Remove the cache."""
+        self.directory.cleanup()
+
+    def test_grid(self):
+        """Test that the grid covers every combination."""
+        stakes = [SEGMENTS, parse_stakes("9 Diamonds=3")]
+        points = grid(stakes, [20, 50], [2, 3, 4])
+        self.assertEqual(12, len(points))
+        self.assertEqual(12, len(set(points)))
+        self.assertEqual(3, dict(points[-1].stakes)["9 Diamonds"])
+
+    def test_only_new_points_computed(self):
+        """Test that re-running a sweep only computes the new points."""
+        first = sweep(grid(starting_values=[20], player_counts=[2, 3]),
+                      n_games=50, cache=self.cache, workers=2)
+        points = grid(starting_values=[20, 30], player_counts=[2, 3])
+        with mock.patch.object(sweep_module, "_project_point",
+                               wraps=sweep_module._project_point) as project:
+            second = sweep(points, n_games=50, cache=self.cache, workers=1)
+        self.assertEqual(2, project.call_count)
+        self.assertEqual(points, list(second))
+        for point, result in first.items():
+            np.testing.assert_array_equal(result, second[point])
+
+    def test_results_independent_of_sweep(self):
+        """Test that a point's results don't depend on the other points."""
+        point = grid(starting_values=[20], player_counts=[3])[0]
+        alone = sweep([point], n_games=50, workers=1)
+        together = sweep(grid(starting_values=[20, 40]), n_games=50,
+                         workers=2)
+        np.testing.assert_array_equal(alone[point], together[point])
+
+    def test_rules_change_key(self):
+        """Test that changing the rules or settings misses the cache."""
+        points = grid([SEGMENTS, parse_stakes("Game=2")], [20], [3])
+        sweep(points[:1], n_games=50, cache=self.cache)
+        with mock.patch.object(sweep_module, "_project_point",
+                               wraps=sweep_module._project_point) as project:
+            sweep(points, n_games=50, cache=self.cache)
+            sweep(points[:1], n_games=60, cache=self.cache)
+        self.assertEqual(2, project.call_count)
+
+    def test_eviction(self):
+        """Test that the least recently used results are evicted."""
+        for i in range(3):
+            self.cache.put(f"key{i}", np.zeros(1000, dtype=np.int32))
+            os.utime(self.cache.path(f"key{i}"), (i, i))
+        size = os.path.getsize(self.cache.path("key0"))
+        self.cache.max_size = 3 * size
+        self.assertIsNotNone(self.cache.get("key0"))
+        self.cache.put("key3", np.zeros(1000, dtype=np.int32))
+        self.assertEqual([True, False, True, True],
+                         [f"key{i}" in self.cache for i in range(4)])
+
+    def test_parse_stakes(self):
+        """Test parsing changes to the stakes."""
+        stakes = parse_stakes("Game=2, 9 Diamonds=4")
+        self.assertEqual(OrderedDict(SEGMENTS, Game=2, **{"9 Diamonds": 4}),
+                         stakes)
+        with self.assertRaises(ValueError):
+            parse_stakes("Joker=1")
@@ -4,6 +4,7 @@ from copy import copy
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPalette
 from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
 
 from table.main import TableView
 
@@ -296,6 +297,54 @@ class TableTest(unittest.TestCase):
         self.finish_dress()
         self.check_player_color("Player3", Qt.yellow)
 
+    def test_board_resize(self):
+        """Test scaling the existing board items to fit the view."""
+        board = self.table.q_board
+        items = board.scene().items()
+        self.table.resize(1600, 1200)
+        self.table.show()
+        QApplication.processEvents()
+        self.assertGreater(board.layout_geometry.radius, board.RADIUS)
+        self.assertEqual(items, board.scene().items())
+        self.assertEqual(2 * board.layout_geometry.radius,
+                         board.scene().sceneRect().width())
+        self.assertEqual(board.size(), board.geometry().size())
+        self.table.hide()
+
+    def test_new_game(self):
+        """Test starting new games, reusing the existing widgets."""
+        self.finish_dress()
+        self.finish_round()
+        board = self.table.q_board
+        pool = list(self.table.q_players.pool)
+
+        # Fewer players hides the spare widgets
+        self.table.new_game(30, ["Ann", "Bob"])
+        self.assertEqual("Round 1 - Dressing", self.table.title())
+        self.assertIs(board, self.table.q_board)
+        self.assertEqual(pool, self.table.q_players.pool)
+        self.assertEqual(["Ann", "Bob"], list(self.table.q_players.players))
+        self.assertEqual("30", self.table.q_players["Ann"].count.text())
+        self.assertEqual(["Ann", "Bob"], [p.title() for p in pool[:2]])
+        self.assertTrue(all(p.isHidden() for p in pool[2:]))
+        for segment in ALL_SEGMENTS:
+            self.assertEqual("0", board.counts[segment].toPlainText())
+            self.assertEqual(["", "Ann", "Bob"],
+                             [board.winners[segment].itemText(i)
+                              for i in range(3)])
+
+        # More players only adds the widgets needed
+        players = [f"P{i}" for i in range(6)]
+        self.table.new_game(40, players)
+        self.assertEqual(pool, self.table.q_players.pool[:4])
+        self.assertEqual(6, len(self.table.q_players.pool))
+        self.assertEqual(players, [p.name for p in self.table.q_players])
+        self.assertFalse(any(p.isHidden() for p in self.table.q_players))
+
+        # Play continues as normal
+        QTest.mouseClick(self.table.q_players["P0"].dress, Qt.LeftButton)
+        self.assertEqual("25", self.table.q_players["P0"].count.text())
+
     def test_dresser_indicator(self):
         """Test displaying the dresser in bold and italics."""
 